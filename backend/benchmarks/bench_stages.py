@@ -0,0 +1,86 @@
+"""
+Per-stage benchmarks over the synthetic corpus. Run through benchmarks/run.py,
+or directly: python -m pytest benchmarks/bench_stages.py
+"""
+import pytest
+from benchmarks.conftest import PAGE_COUNTS, LAYOUTS, JD_SHAPES
+from services.resume_parser import extract_text
+from services.section_splitter import section_spans
+from services.nlp_processor import preprocess, warm_up
+from services.keywords_finder import extract_skills
+from services.evaluation_pipeline import parsed_resume, analyze_sections, score_resume
+from services.skills_scoring import skills_scoring
+from services.experience_scoring import experience_scoring
+from services.project_scoring import project_scoring
+from services.validators import validate_document_type, validate_job_description
+
+pages_and_layouts = pytest.mark.parametrize("pages,layout", [(p, l) for p in PAGE_COUNTS for l in LAYOUTS])
+jd_shapes = pytest.mark.parametrize("shape", JD_SHAPES, ids=[f"{words}w-{density}" for words, density in JD_SHAPES])
+
+
+@pytest.fixture(scope="module", autouse=True)
+def model():
+    warm_up()
+
+
+@pytest.fixture(scope="module")
+def texts(resumes) -> dict:
+    return {key: extract_text(pdf) for key, pdf in resumes.items()}
+
+
+@pytest.fixture(scope="module")
+def analyses(texts) -> dict:
+    # known=[{}]: analyze every section, bypassing the section cache.
+    return {key: analyze_sections([parsed_resume(text)], [{}])[0] for key, text in texts.items()}
+
+
+@pages_and_layouts
+def test_resume_parser(benchmark, resumes, pages, layout):
+    benchmark(extract_text, resumes[pages, layout])
+
+
+@pages_and_layouts
+def test_section_splitter(benchmark, texts, pages, layout):
+    benchmark(section_spans, texts[pages, layout])
+
+
+@pages_and_layouts
+def test_resume_nlp(benchmark, texts, pages, layout):
+    parsed = parsed_resume(texts[pages, layout])
+    benchmark(analyze_sections, [parsed], [{}])
+
+
+@jd_shapes
+def test_preprocess(benchmark, job_descriptions, shape):
+    benchmark(preprocess, job_descriptions[shape])
+
+
+@jd_shapes
+def test_extract_skills(benchmark, job_descriptions, shape):
+    benchmark(extract_skills, job_descriptions[shape])
+
+
+@jd_shapes
+def test_validate_job_description(benchmark, job_descriptions, shape):
+    benchmark(validate_job_description, job_descriptions[shape])
+
+
+@pytest.mark.parametrize("pages", PAGE_COUNTS)
+def test_validate_document_type(benchmark, texts, pages):
+    benchmark(validate_document_type, texts[pages, "standard"])
+
+
+@pytest.mark.parametrize("scorer", ["skills", "experience", "projects", "all"])
+def test_scorers(benchmark, analyses, job_descriptions, scorer):
+    analysis = analyses[3, "standard"]
+    jd_skills = extract_skills(job_descriptions[JD_SHAPES[1]])
+    skills, actions = analysis["skills"], analysis["actions"]
+
+    if scorer == "skills":
+        benchmark(skills_scoring, skills["skills"], jd_skills)
+    elif scorer == "experience":
+        benchmark(experience_scoring, skills["experience"], actions["experience"], jd_skills)
+    elif scorer == "projects":
+        benchmark(project_scoring, skills["projects"], actions["projects"], jd_skills)
+    else:
+        benchmark(score_resume, analysis, jd_skills)
@@ -0,0 +1,46 @@
+"""
+Compares two benchmark result files by median time and exits non-zero if any
+benchmark got slower than the threshold.
+
+    cd backend && python -m benchmarks.compare results/abc1234.json results/def5678.json --threshold 10
+"""
+import argparse
+import json
+import sys
+
+
+def medians(path: str) -> dict:
+    with open(path) as f:
+        data = json.load(f)
+    return {bench["fullname"]: bench["stats"]["median"] for bench in data["benchmarks"]}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Allowed slowdown, in percent")
+    args = parser.parse_args()
+
+    baseline, candidate = medians(args.baseline), medians(args.candidate)
+    regressions = 0
+
+    print(f"{'benchmark':<70} {'baseline':>11} {'candidate':>11} {'change':>8}")
+    for name in sorted(baseline.keys() & candidate.keys()):
+        before, after = baseline[name], candidate[name]
+        change = (after - before) / before * 100 if before else 0.0
+        flag = ""
+        if change > args.threshold:
+            flag = "  REGRESSION"
+            regressions += 1
+        print(f"{name.split('::', 1)[-1]:<70} {before * 1000:>9.3f}ms {after * 1000:>9.3f}ms {change:>+7.1f}%{flag}")
+
+    for name in sorted(baseline.keys() ^ candidate.keys()):
+        print(f"{name.split('::', 1)[-1]:<70} only in {'baseline' if name in baseline else 'candidate'}")
+
+    print(f"{regressions} regression(s) over {args.threshold:g}%")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
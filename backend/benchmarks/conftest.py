@@ -0,0 +1,20 @@
+import pytest
+from benchmarks.corpus import resume_pdf, job_description
+
+PAGE_COUNTS = (1, 3, 10)
+LAYOUTS = ("standard", "variant")
+# (words, skill density)
+JD_SHAPES = ((50, 0.05), (150, 0.1), (400, 0.25))
+
+
+@pytest.fixture(scope="session")
+def resumes() -> dict:
+    return {
+        (pages, layout): resume_pdf(pages, layout, seed=pages)
+        for pages in PAGE_COUNTS for layout in LAYOUTS
+    }
+
+
+@pytest.fixture(scope="session")
+def job_descriptions() -> dict:
+    return {shape: job_description(*shape, seed=shape[0]) for shape in JD_SHAPES}
@@ -0,0 +1,163 @@
+"""
+Synthetic, seeded resume PDFs and job descriptions for the benchmarks.
+
+The PDF writer is self-contained (one Helvetica text stream per page), so the
+corpus can be rebuilt anywhere without extra packages:
+
+    cd backend && python -m benchmarks.corpus --out /tmp/corpus
+"""
+import argparse
+import os
+import random
+from services.taxonomy import get_taxonomy
+
+LINES_PER_PAGE = 50
+LINE_WIDTH = 90
+
+# Heading sets per layout; "variant" uses the longer headings and trailing
+# punctuation the splitter also accepts.
+LAYOUTS = {
+    "standard": ["Skills", "Experience", "Projects", "Education"],
+    "experience_first": ["Work Experience", "Projects", "Technical Skills", "Education"],
+    "variant": ["PROFESSIONAL EXPERIENCE:", "Key Projects -", "Core Skills |", "Academic Background"],
+}
+
+FILLER = (
+    "team product customer quality delivery process platform users reliable scalable "
+    "service internal review release feature support metrics latency throughput "
+    "requirements stakeholders ownership roadmap testing documentation migration"
+).split()
+
+
+def make_pdf(pages: list) -> bytes:
+    """
+    Writes a minimal PDF with one page per list of text lines.
+    """
+    objects = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    # Page objects reference their parent, which is written after all pages.
+    pages_id = len(objects) + 2 * len(pages) + 1
+    kids = []
+    for lines in pages:
+        escaped = (line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") for line in lines)
+        stream = ("BT /F1 10 Tf 40 800 Td 15 TL " + " ".join(f"({line}) '" for line in escaped) + " ET").encode("latin-1", "replace")
+        content = add(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        kids.append(add((
+            f"<< /Type /Page /Parent {pages_id} 0 R /MediaBox [0 0 612 842] "
+            f"/Resources << /Font << /F1 {font} 0 R >> >> /Contents {content} 0 R >>"
+        ).encode()))
+    add(f"<< /Type /Pages /Kids [{' '.join(f'{kid} 0 R' for kid in kids)}] /Count {len(kids)} >>".encode())
+    catalog = add(f"<< /Type /Catalog /Pages {pages_id} 0 R >>".encode())
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        output += b"%010d 00000 n \n" % offset
+    output += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog, xref)
+
+    return bytes(output)
+
+
+def _vocabulary() -> tuple:
+    taxonomy = get_taxonomy()
+    skills = sorted(alias for aliases in taxonomy.skills.values() for alias in aliases)
+    actions = sorted(alias for aliases in taxonomy.actions.values() for alias in aliases)
+    return skills, actions
+
+
+def _wrap(words: list) -> list:
+    lines, line = [], ""
+    for word in words:
+        if line and len(line) + len(word) + 1 > LINE_WIDTH:
+            lines.append(line)
+            line = word
+        else:
+            line = f"{line} {word}" if line else word
+    if line:
+        lines.append(line)
+    return lines
+
+
+def _past_tense(verb: str) -> str:
+    return verb.capitalize() + ("d" if verb.endswith("e") else "ed")
+
+
+def _paragraph(rng: random.Random, length: int, terms: list, density: float) -> list:
+    words = [rng.choice(terms) if rng.random() < density else rng.choice(FILLER) for _ in range(length)]
+    return _wrap(words)
+
+
+def resume_pages(pages: int = 1, layout: str = "standard", skill_density: float = 0.15, seed: int = 0) -> list:
+    """
+    Lines of a synthetic resume filling `pages` pages, with its sections in the
+    order and heading style of `layout`.
+    """
+    rng = random.Random(seed)
+    skills, actions = _vocabulary()
+    budget = pages * LINES_PER_PAGE - 2
+    lines = [f"Candidate {seed}", "Software engineer"]
+
+    # Sections share the line budget; experience and projects get the most.
+    shares = {"skill": 0.1, "experience": 0.45, "project": 0.35, "education": 0.1}
+    for heading in LAYOUTS[layout]:
+        kind = next(name for name in shares if name in heading.lower() or (name == "education" and "academic" in heading.lower()))
+        lines.append(heading)
+        room = max(1, int(budget * shares[kind]) - 1)
+        if kind == "skill":
+            section = _wrap([", ".join(rng.sample(skills, min(len(skills), 3 + room * 4)))])
+        elif kind == "education":
+            section = ["BSc Computer Science, 2019"] + _paragraph(rng, room * 10, FILLER, 0)
+        else:
+            section = []
+            while len(section) < room:
+                section += _wrap([_past_tense(rng.choice(actions))]) + _paragraph(rng, 24, skills, skill_density)
+        lines.extend(section[:room])
+
+    return [lines[start:start + LINES_PER_PAGE] for start in range(0, len(lines), LINES_PER_PAGE)]
+
+
+def resume_pdf(pages: int = 1, layout: str = "standard", skill_density: float = 0.15, seed: int = 0) -> bytes:
+    return make_pdf(resume_pages(pages, layout, skill_density, seed))
+
+
+def job_description(words: int = 120, skill_density: float = 0.1, seed: int = 0) -> str:
+    """
+    A synthetic JD of roughly `words` words, `skill_density` of them taxonomy skills.
+    """
+    rng = random.Random(seed)
+    skills, _ = _vocabulary()
+    body = " ".join(rng.choice(skills) if rng.random() < skill_density else rng.choice(FILLER) for _ in range(words))
+    return f"We are hiring a backend engineer. {body}."
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--out", required=True)
+    parser.add_argument("--count", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+    rng = random.Random(args.seed)
+    for index in range(args.count):
+        pages = rng.choice((1, 2, 3, 5, 10))
+        layout = rng.choice(sorted(LAYOUTS))
+        with open(os.path.join(args.out, f"resume_{index:03d}_{layout}_{pages}p.pdf"), "wb") as f:
+            f.write(resume_pdf(pages, layout, seed=args.seed + index))
+        with open(os.path.join(args.out, f"jd_{index:03d}.txt"), "w") as f:
+            f.write(job_description(rng.choice((50, 150, 400)), rng.choice((0.05, 0.1, 0.25)), seed=args.seed + index))
+    print(f"Wrote {args.count} resumes and JDs to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Runs the benchmark suite and stores pytest-benchmark's JSON under
+benchmarks/results/<commit>.json (not committed), for benchmarks/compare.py.
+
+    cd backend && python -m benchmarks.run [-k resume_parser] [--name baseline]
+"""
+import argparse
+import os
+import subprocess
+import sys
+import pytest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SUITES = ["bench_stages.py", "bench_evaluate.py"]
+
+
+def commit_name() -> str:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True).stdout.strip()
+        return commit + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return "local"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--name", help="Results file name (default: the current commit)")
+    parser.add_argument("-k", help="Only run benchmarks matching this expression")
+    args = parser.parse_args()
+
+    os.makedirs(os.path.join(HERE, "results"), exist_ok=True)
+    output = os.path.join(HERE, "results", f"{args.name or commit_name()}.json")
+    pytest_args = [os.path.join(HERE, suite) for suite in SUITES]
+    pytest_args += ["-q", f"--benchmark-json={output}", "--benchmark-columns=median,iqr,ops,rounds"]
+    if args.k:
+        pytest_args += ["-k", args.k]
+
+    code = pytest.main(pytest_args)
+    print(f"Results written to {output}")
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""
+Startup-time benchmark: import time of the app, lifespan startup time and latency
+of the first request that needs spaCy, with and without the startup warm-up.
+Each run is a fresh interpreter against a throwaway SQLite database.
+
+    cd backend && python -m benchmarks.startup --runs 3
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+JD = "Looking for a backend engineer with python, django, postgresql and docker experience."
+
+# Runs in the child interpreter; prints one JSON line of timings in milliseconds.
+PROBE = f"""
+import json, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(main.app) as client:
+    ready = time.perf_counter()
+    # JD analysis runs in this process; no PDFs keeps the parser out of the timing.
+    response = client.post("/evaluate/rank", data={{"jd_data": {JD!r}}}, files=[("files", ("none.txt", b"", "text/plain"))])
+    response.raise_for_status()
+    first = time.perf_counter()
+    client.post("/evaluate/rank", data={{"jd_data": {JD!r} + " kubernetes"}}, files=[("files", ("none.txt", b"", "text/plain"))])
+    second = time.perf_counter()
+print(json.dumps({{
+    "import_ms": (imported - started) * 1000,
+    "startup_ms": (ready - imported) * 1000,
+    "first_request_ms": (first - ready) * 1000,
+    "second_request_ms": (second - first) * 1000,
+}}))
+"""
+
+
+def run(warm: bool) -> dict:
+    env = dict(os.environ)
+    env["NLP_WARMUP"] = "1" if warm else "0"
+    env["CPU_WORKERS"] = env.get("CPU_WORKERS", "1")
+    env["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'startup.db')}"
+    env["RESULT_CACHE_DB"] = ""
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE], env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    for warm in (False, True):
+        runs = [run(warm) for _ in range(args.runs)]
+        print(f"{'warm-up at startup' if warm else 'lazy (no warm-up)'}:")
+        for key in runs[0]:
+            print(f"  {key:<18} {statistics.median(run[key] for run in runs):8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+# Preload-then-fork deployment:
+#     cd backend && gunicorn main:app -c gunicorn.conf.py
+#
+# The master imports the app, loads the taxonomy and the spaCy model once, then
+# forks the workers, which share those pages copy-on-write instead of each loading
+# its own copy. Each worker's process pool forks from the worker and shares them too.
+import gc
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+# Startup work (pool spawn) happens per worker in the app lifespan.
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+
+# The workers were forked after the model loaded; loading it again is a no-op.
+raw_env = ["NLP_WARMUP=0"]
+
+
+def on_starting(server):
+    from services.taxonomy import get_taxonomy
+    from services.nlp_processor import warm_up
+    from services.semantic_matcher import warm_up as warm_up_semantic
+
+    warm_up_semantic(get_taxonomy())
+    warm_up()
+    # Keep the collector from touching (and so copying) the preloaded objects
+    # in every worker.
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    # Connections opened by the master must not be shared with the workers.
+    from database import engine
+    engine.dispose(close=False)
@@ -1,5 +1,5 @@
 from database import engine, Base
-from models import User, Evaluation
+from models import User, Evaluation, EvaluationMissingSkill, SkillRollup, DailyRollup, JobProfile, Candidate, EvaluationJob
 import sys
 
 def init_db():
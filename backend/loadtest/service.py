@@ -0,0 +1,218 @@
+"""
+Mixed-endpoint load test: drives /evaluate, /verify-user and /admin/stats at a
+fixed concurrency for a while and reports p50/p95/p99 latency, throughput and
+error rate per endpoint. Exits 1 when an SLO is breached, so it can gate a rollout.
+
+By default the app runs in this process (through its lifespan) against a
+throwaway SQLite database. The client shares the event loop with the app, so
+anything blocking the loop shows up as latency on every endpoint and in the
+loop lag line. --database-url points it at another database (e.g. a local
+Postgres), --url at an already running server instead.
+
+    cd backend && python -m loadtest.service --concurrency 16 --duration 30
+    cd backend && python -m loadtest.service --slo evaluate.p95=1500 --slo admin-stats.p99=100
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+import numpy as np
+
+# Relative weights of the endpoints in the mix.
+MIX = {"evaluate": 2, "verify-user": 5, "admin-stats": 1}
+# Latency SLOs in milliseconds, overridden with --slo endpoint.pNN=ms.
+SLOS = {
+    "evaluate.p95": 2000,
+    "verify-user.p95": 100,
+    "admin-stats.p95": 200,
+    "loop-lag.p99": 100,
+}
+PERCENTILES = (50, 95, 99)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30, help="Seconds to run after warm-up")
+    parser.add_argument("--warmup", type=float, default=3, help="Seconds run first and left out of the report")
+    parser.add_argument("--mix", default=",".join(f"{name}={weight}" for name, weight in MIX.items()))
+    parser.add_argument("--users", type=int, default=200, help="Distinct emails")
+    parser.add_argument("--resumes", type=int, default=20, help="Distinct resume PDFs")
+    parser.add_argument("--jds", type=int, default=5, help="Distinct job descriptions")
+    parser.add_argument("--slo", action="append", default=[], help="endpoint.pNN=ms, e.g. evaluate.p95=1500")
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument("--database-url", help="Default: a throwaway SQLite file")
+    parser.add_argument("--url", help="Load an already running server instead of an in-process app")
+    parser.add_argument("--keep-rate-limit", action="store_true", help="Leave RATE_LIMIT_PER_MINUTE as configured")
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+def parse_pairs(pairs: list, cast=float) -> dict:
+    parsed = {}
+    for pair in pairs:
+        name, _, value = pair.partition("=")
+        if not value:
+            raise SystemExit(f"Expected name=value, got {pair!r}")
+        parsed[name.strip()] = cast(value)
+    return parsed
+
+
+class Workload:
+    """
+    The requests of the mix, over a fixed set of users, resumes and JDs, so the
+    caches see repeats the way they would in production.
+    """
+
+    def __init__(self, mix: dict, users: int, resumes: int, jds: int, seed: int):
+        from benchmarks.corpus import job_description, resume_pdf
+
+        self.rng = random.Random(seed)
+        self.names = list(mix)
+        self.weights = [mix[name] for name in self.names]
+        self.emails = [f"load{index}@example.com" for index in range(users)]
+        self.resumes = [resume_pdf(self.rng.choice((1, 1, 2, 3)), seed=seed + index) for index in range(resumes)]
+        self.jds = [job_description(150, seed=seed + index) for index in range(jds)]
+
+    def next(self) -> tuple:
+        name = self.rng.choices(self.names, self.weights)[0]
+        email = self.rng.choice(self.emails)
+
+        if name == "evaluate":
+            return name, dict(
+                method="POST",
+                url="/evaluate",
+                data={"jd_data": self.rng.choice(self.jds), "email": email},
+                files={"file": ("resume.pdf", self.rng.choice(self.resumes), "application/pdf")},
+            )
+        if name == "verify-user":
+            return name, dict(method="POST", url="/verify-user", json={"email": email, "name": email.split("@")[0]})
+        if name == "admin-stats":
+            return name, dict(method="GET", url="/admin/stats")
+        raise SystemExit(f"Unknown endpoint in --mix: {name}")
+
+
+async def worker(client, workload: Workload, deadline: float, samples: list) -> None:
+    while time.perf_counter() < deadline:
+        name, request = workload.next()
+        started = time.perf_counter()
+        try:
+            response = await client.request(**request)
+            ok = response.status_code < 400
+        except Exception as e:
+            print(f"{name}: {type(e).__name__}: {e}")
+            ok = False
+        samples.append((name, time.perf_counter() - started, ok))
+
+
+async def loop_lag(deadline: float, lags: list, interval: float = 0.01) -> None:
+    # How late a short sleep wakes up: time the loop spent running something else.
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - started - interval)
+
+
+async def drive(client, workload: Workload, args, in_process: bool) -> tuple:
+    warmup = []
+    deadline = time.perf_counter() + args.warmup
+    await asyncio.gather(*(worker(client, workload, deadline, warmup) for _ in range(args.concurrency)))
+
+    samples, lags = [], []
+    started = time.perf_counter()
+    deadline = started + args.duration
+    tasks = [worker(client, workload, deadline, samples) for _ in range(args.concurrency)]
+    if in_process:
+        tasks.append(loop_lag(deadline, lags))
+    await asyncio.gather(*tasks)
+
+    return samples, lags, time.perf_counter() - started
+
+
+async def run(args, workload: Workload) -> tuple:
+    import httpx
+
+    timeout = httpx.Timeout(60.0)
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url, timeout=timeout) as client:
+            return await drive(client, workload, args, in_process=False)
+
+    from database import engine, Base
+    import models  # noqa: F401 (registers the tables)
+    from main import app
+
+    Base.metadata.create_all(bind=engine)
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=timeout) as client:
+            return await drive(client, workload, args, in_process=True)
+
+
+def report(samples: list, lags: list, elapsed: float, slos: dict, max_error_rate: float) -> list:
+    """
+    Prints the per-endpoint table and returns the breached SLOs.
+    """
+    print(f"{'endpoint':<14}{'requests':>10}{'req/s':>10}{'errors':>10}" + "".join(f"{'p%d ms' % p:>11}" for p in PERCENTILES))
+
+    breaches = []
+    latencies = {}
+    for name in sorted({sample[0] for sample in samples}):
+        rows = [sample for sample in samples if sample[0] == name]
+        seconds = np.array([sample[1] for sample in rows])
+        errors = sum(1 for sample in rows if not sample[2]) / len(rows)
+        latencies[name] = dict(zip((f"p{p}" for p in PERCENTILES), np.percentile(seconds, PERCENTILES) * 1000))
+
+        print(
+            f"{name:<14}{len(rows):>10}{len(rows) / elapsed:>10.1f}{errors:>10.2%}"
+            + "".join(f"{latencies[name][f'p{p}']:>11.1f}" for p in PERCENTILES)
+        )
+        if errors > max_error_rate:
+            breaches.append(f"{name} error rate {errors:.2%} > {max_error_rate:.2%}")
+
+    print(f"{'total':<14}{len(samples):>10}{len(samples) / elapsed:>10.1f}")
+    if lags:
+        latencies["loop-lag"] = dict(zip((f"p{p}" for p in PERCENTILES), np.percentile(lags, PERCENTILES) * 1000))
+        print("event loop lag " + ", ".join(f"p{p} {latencies['loop-lag'][f'p{p}']:.1f} ms" for p in PERCENTILES) + f", max {max(lags) * 1000:.1f} ms")
+
+    for slo, limit in slos.items():
+        name, _, percentile = slo.rpartition(".")
+        measured = latencies.get(name, {}).get(percentile)
+        if measured is not None and measured > limit:
+            breaches.append(f"{name} {percentile} {measured:.1f} ms > {limit:g} ms")
+
+    return breaches
+
+
+def main():
+    args = parse_args()
+    mix = parse_pairs(args.mix.split(","))
+    slos = {**SLOS, **parse_pairs(args.slo)}
+
+    if not args.url:
+        # Set before main (and so database) is imported.
+        os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='loadtest_'), 'load.db')}"
+        os.environ.setdefault("RESULT_CACHE_DB", "")
+        if not args.keep_rate_limit:
+            # One client plays every user; the limiter would reject most of the mix.
+            os.environ["RATE_LIMIT_PER_MINUTE"] = "0"
+
+    workload = Workload(mix, args.users, args.resumes, args.jds, args.seed)
+    print(f"{args.concurrency} concurrent clients, {args.duration:g}s after {args.warmup:g}s warm-up, mix {mix}")
+
+    samples, lags, elapsed = asyncio.run(run(args, workload))
+    if not samples:
+        print("No requests completed")
+        return 1
+
+    breaches = report(samples, lags, elapsed, slos, args.max_error_rate)
+    for breach in breaches:
+        print(f"SLO breached: {breach}")
+    print("FAILED" if breaches else "OK")
+    return 1 if breaches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
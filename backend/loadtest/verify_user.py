@@ -0,0 +1,83 @@
+"""
+Login load test for /verify-user against a throwaway SQLite database.
+
+Counts the SQL statements each login costs (cold, warm and new-user), times the
+endpoint, and races concurrent first logins for the same email to check the upsert.
+
+    cd backend && python -m loadtest.verify_user --users 200 --logins 5000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+DB_FILE = os.path.join(tempfile.mkdtemp(prefix="verify_user_"), "load.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_FILE}"
+
+from sqlalchemy import event, func, select
+from fastapi.testclient import TestClient
+from database import engine, Base, SessionLocal
+from models import User
+from services.user_roles import role_cache
+from main import app
+
+statements = {"count": 0}
+
+
+@event.listens_for(engine, "before_cursor_execute")
+def _count(conn, cursor, statement, parameters, context, executemany):
+    statements["count"] += 1
+
+
+def login(client, email):
+    response = client.post("/verify-user", json={"email": email, "name": email.split("@")[0]})
+    response.raise_for_status()
+    return response.json()["role"]
+
+
+def measure(client, emails):
+    before = statements["count"]
+    started = time.perf_counter()
+    for email in emails:
+        login(client, email)
+    elapsed = time.perf_counter() - started
+    return (statements["count"] - before) / len(emails), elapsed / len(emails) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--logins", type=int, default=5000)
+    parser.add_argument("--racers", type=int, default=16)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    client = TestClient(app)
+    emails = [f"user{i}@example.com" for i in range(args.users)]
+
+    new_q, new_ms = measure(client, emails)
+    role_cache.clear()
+    cold_q, cold_ms = measure(client, emails)
+    warm = [emails[i % len(emails)] for i in range(args.logins)]
+    warm_q, warm_ms = measure(client, warm)
+
+    print(f"new users:    {new_q:.2f} statements/login, {new_ms:.2f} ms/login")
+    print(f"cold logins:  {cold_q:.2f} statements/login, {cold_ms:.2f} ms/login")
+    print(f"warm logins:  {warm_q:.2f} statements/login, {warm_ms:.2f} ms/login")
+
+    racer = "race@example.com"
+    with ThreadPoolExecutor(max_workers=args.racers) as pool:
+        roles = list(pool.map(lambda _: login(client, racer), range(args.racers)))
+    with SessionLocal() as db:
+        rows = db.execute(select(func.count()).select_from(User).where(User.email == racer)).scalar()
+    print(f"race:         {args.racers} concurrent first logins -> {rows} row(s), roles {sorted(set(roles))}")
+
+    ok = rows == 1 and warm_q == 0
+    print("OK" if ok else "FAILED")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,28 +1,61 @@
-from fastapi import FastAPI, File, UploadFile, Form, Depends, HTTPException
+from fastapi import FastAPI, File, UploadFile, Form, Query, Depends, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse, PlainTextResponse, JSONResponse
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
+from typing import List
+from contextlib import asynccontextmanager
+import asyncio
 import os
+import time
+import weakref
 from dotenv import load_dotenv
-from services.resume_parser import resume_parser
-from services.section_splitter import section_splitter
-from services.keywords_finder import extract_skills, extract_actions
-from services.skills_scoring import skills_scoring
-from services.experience_scoring import experience_scoring
-from services.project_scoring import project_scoring
-from services.calculate_final_score import calculate_final_score
-from database import engine, get_db, Base
-from models import User, Evaluation
-from services.validators import validate_document_type, validate_safety_intent, validate_technical_signal
+from services.evaluation_pipeline import analyze_job_description_async, analyze_resume_async, score_resume, generate_suggestions
+from services.resume_parser import spool_upload, SpooledUpload, DocumentTooLarge
+from services.executors import start_executors, shutdown_executors, cpu_pool, evaluation_gate, batch_gate
+from services.batch_evaluator import evaluate_batch, rank_batch, analyze_resumes
+from services.candidate_store import store_candidates, top_candidates
+from services.taxonomy import get_taxonomy, reload_taxonomy
+from services.nlp_processor import warm_up
+from services.semantic_matcher import warm_up as warm_up_semantic
+from services.result_cache import cache_stats
+from database import get_db, SessionLocal, AsyncSessionLocal
+from services.revisions import jd_key, revision_delta
+from services.rate_limiter import evaluation_limiter, client_key
+from services.coalescing import evaluation_coalescer
+from services.job_profiles import save_job_profile, get_job_profile, job_response, job_analysis_async
+from services.user_roles import get_or_create_role, set_user_role, ROLES
+from services.admin_auth import require_admin
+from services.evaluation_store import admin_stats, admin_stats_async
+from services.evaluation_writer import evaluation_writer
+from services.evaluation_queue import evaluation_queue, enqueue_evaluation, evaluation_status, queue_full
+from services.callbacks import callback_error
+from services.metrics import (
+    METRICS_ENABLED, TIMING_HEADER, PROFILE_SAMPLE_RATE, request_seconds,
+    track_request, timing_header, maybe_profile, render_metrics, count_rejection
+)
 from pydantic import BaseModel
 import json
-from sqlalchemy import func
 
 # ... (Load dotenv and App setup remain same) ...
 load_dotenv()
 # ... (Startup modifications remain same) ...
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # The spaCy model loads lazily; take the hit here rather than on the first request
+    # (the process pool's children are forked from this process and inherit it).
+    if os.getenv("NLP_WARMUP", "1") == "1":
+        warm_up_semantic(get_taxonomy())
+        warm_up()
+    start_executors()
+    evaluation_writer.start()
+    evaluation_queue.start()
+    yield
+    await evaluation_queue.stop()
+    evaluation_writer.stop()
+    shutdown_executors()
 
-Base.metadata.create_all(bind=engine)
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -30,177 +63,410 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Timing"],
 )
 
+
+async def instrument(request, call_next):
+    started = time.perf_counter()
+    with track_request() as timings, maybe_profile(request.url.path):
+        response = await call_next(request)
+    elapsed = time.perf_counter() - started
+
+    route = request.scope.get("route")
+    if METRICS_ENABLED:
+        # Route templates, not raw paths, keep the label set bounded.
+        request_seconds.observe(elapsed, route.path if route else "unmatched")
+    if timings is not None:
+        response.headers["X-Timing"] = timing_header(timings, elapsed)
+    return response
+
+# Only installed when something needs it, so a disabled setup pays nothing per request.
+if METRICS_ENABLED or TIMING_HEADER or PROFILE_SAMPLE_RATE > 0:
+    app.middleware("http")(instrument)
+
 class UserVerifyRequest(BaseModel):
     email: str
     name: str
+
+class RoleUpdateRequest(BaseModel):
+    role: str
+
+class JobCreateRequest(BaseModel):
+    jd_data: str
 # --- Endpoints ---
 
 @app.post("/verify-user")
 def verify_user(user: UserVerifyRequest, db: Session = Depends(get_db)):
     try:
-        db_user = db.query(User).filter(User.email == user.email).first()
-        if not db_user:
-            new_user = User(email=user.email, name=user.name, role="user")
-            db.add(new_user)
-            db.commit()
-            db.refresh(new_user)
-            return {"role": new_user.role}
-        return {"role": db_user.role}
+        return {"role": get_or_create_role(db, user.email, user.name)}
     except Exception as e:
         print(f"DB Error (verify-user): {e}")
-        # Fallback: Allow login as 'user' even if DB fails
+        # Fallback: Allow login as 'user' even if DB fails (not cached, so the next login retries)
         return {"role": "user"}
 
 
+@app.put("/admin/users/{email}/role", dependencies=[Depends(require_admin)])
+def update_user_role(email: str, update: RoleUpdateRequest, db: Session = Depends(get_db)):
+    if update.role not in ROLES:
+        raise HTTPException(status_code=400, detail=f"Role must be one of: {', '.join(ROLES)}")
+    if not set_user_role(db, email, update.role):
+        raise HTTPException(status_code=404, detail="User not found")
+
+    return {"email": email, "role": update.role}
+
+
 @app.get("/admin/stats")
-def get_admin_stats(db: Session = Depends(get_db)):
-    user_count = db.query(User).count()
-    
-    # Calculate average score
-    avg_score_result = db.query(func.avg(Evaluation.final_score)).scalar()
-    avg_score = round(avg_score_result, 1) if avg_score_result else 0
-
-    # Calculate top missing skills (This is a bit complex with comma-separated strings, but doable)
-    # Ideally we'd fetch all and aggregate in python for simplicity with small data
-    evaluations = db.query(Evaluation).all()
-    skill_counts = {}
-    for eval in evaluations:
-        if eval.missing_skills:
-            try:
-                skills = json.loads(eval.missing_skills)
-                for skill in skills:
-                    skill_counts[skill] = skill_counts.get(skill, 0) + 1
-            except:
-                pass # Ignore parsing errors
-    
-    top_missing = sorted(skill_counts.items(), key=lambda x: x[1], reverse=True)[:5]
-    top_missing_skills = [skill for skill, count in top_missing]
+async def get_admin_stats():
+    # Served from the rollup tables maintained on every insert (services/evaluation_store.py)
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as db:
+            return await admin_stats_async(db)
+
+    def query():
+        with SessionLocal() as db:
+            return admin_stats(db)
+
+    return await run_in_threadpool(query)
+
+@app.get("/metrics")
+def metrics():
+    # Prometheus text format: stage/request latency histograms, PDF pages, upload
+    # sizes, validator rejections and result-cache hit rates.
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+@app.get("/admin/cache", dependencies=[Depends(require_admin)])
+def get_cache_stats():
+    return cache_stats()
+
+@app.post("/admin/taxonomy/reload", dependencies=[Depends(require_admin)])
+def reload_skill_taxonomy():
+    # Swaps in the edited taxonomy file for this worker; in-flight requests are unaffected.
+    try:
+        taxonomy = reload_taxonomy()
+    except Exception as e:
+        print(f"Taxonomy reload failed: {e}")
+        raise HTTPException(status_code=500, detail="Taxonomy reload failed")
 
     return {
-        "total_users": user_count,
-        "avg_score": avg_score,
-        "top_missing_skills": top_missing_skills if top_missing_skills else ["None yet"]
+        "version": taxonomy.version,
+        "skills": len(taxonomy.skills),
+        "actions": len(taxonomy.actions)
     }
 
+@app.post("/jobs", status_code=201)
+async def create_job(job: JobCreateRequest):
+    """
+    Validates and extracts a JD once and stores its profile; /evaluate can then
+    take the returned id as job_id instead of the JD text.
+    """
+    with evaluation_gate.admit():
+        analysis = await analyze_job_description_async(job.jd_data)
+
+    def save():
+        with SessionLocal() as db:
+            return job_response(save_job_profile(db, job.jd_data, analysis))
+
+    return await run_in_threadpool(save)
+
+@app.get("/jobs/{job_id}")
+def get_job(job_id: int, db: Session = Depends(get_db)):
+    job = get_job_profile(db, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_response(job)
+
+@app.get("/jobs/{job_id}/top")
+async def top_candidates_for_job(job_id: int, k: int = Query(50, ge=1, le=1000)):
+    """
+    The k best candidates in the stored pool (POST /candidates) for a job,
+    scored with the same formulas as /evaluate.
+    """
+    with evaluation_gate.admit():
+        jd_analysis = await job_analysis_async(job_id)
+    if jd_analysis is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if jd_analysis["rejection"]:
+        return jd_analysis["rejection"]
+
+    def query():
+        with SessionLocal() as db:
+            return top_candidates(db, jd_analysis["skills"], k)
+
+    return {"job_id": job_id, **await run_in_threadpool(query)}
+
+@app.post("/candidates")
+async def ingest_candidates(
+    files: List[UploadFile] = File(...),
+    email: str = Form(None), # Optional uploader email
+):
+    """
+    Extracts many resumes and stores their findings in the candidate pool, for
+    /jobs/{job_id}/top. Re-uploading a stored PDF returns its existing id.
+    """
+    with batch_gate.admit():
+        return await ingest_uploads(files, email)
+
+
+async def ingest_uploads(files: List[UploadFile], email: str) -> list:
+    uploads = []
+    for file in files:
+        if not file.filename.endswith(".pdf"):
+            uploads.append((file.filename, "Only PDF resumes are supported"))
+            continue
+        try:
+            uploads.append((file.filename, await spool_upload(file)))
+        except DocumentTooLarge as e:
+            uploads.append((file.filename, str(e)))
+
+    pdfs = [(name, upload) for name, upload in uploads if isinstance(upload, SpooledUpload)]
+
+    def ingest():
+        results, stored = {}, []
+        for (name, upload), item in zip(pdfs, analyze_resumes(pdfs, pool=cpu_pool())):
+            analysis = item["analysis"]
+            if analysis is None:
+                results[upload.digest] = {"status": "error", "error": item["error"]}
+            elif analysis["rejection"]:
+                results[upload.digest] = {"status": "rejected", "error": analysis["rejection"]["suggestions"][0]}
+            else:
+                stored.append((name, upload.digest, analysis))
+
+        with SessionLocal() as db:
+            for (_, digest, _), (_, candidate_id, is_new) in zip(stored, store_candidates(db, stored, email)):
+                results[digest] = {"status": "stored" if is_new else "existing", "candidate_id": candidate_id}
+        return results
+
+    try:
+        results = await run_in_threadpool(ingest)
+    finally:
+        for _, upload in pdfs:
+            upload.remove()
+
+    return [
+        {"filename": name, **results[upload.digest]} if isinstance(upload, SpooledUpload)
+        else {"filename": name, "status": "error", "error": upload}
+        for name, upload in uploads
+    ]
+
 @app.post("/evaluate")
 async def evaluate_resume(
-    jd_data: str = Form(...), 
+    request: Request,
+    jd_data: str = Form(None),
     file: UploadFile = File(...), 
     email: str = Form(None), # Optional email
-    db: Session = Depends(get_db)
+    job_id: int = Form(None), # A stored JD profile (POST /jobs), instead of jd_data
+    callback_url: str = Form(None), # With ?async=1: POSTed the result when it's ready
+    async_mode: bool = Query(False, alias="async"),
 ):
     if not file.filename.endswith(".pdf"):
         raise HTTPException(status_code=400, detail="Only PDF resumes are supported")
+    if (jd_data is None) == (job_id is None):
+        raise HTTPException(status_code=400, detail="Provide either jd_data or job_id")
 
-    # 1. Safety & Intent Filter on JD
-    safety_error = validate_safety_intent(jd_data)
-    if safety_error:
-        return {
-            "final_score": 0,
-            "match_level": "Safety Violation",
-            "score_breakdown": {
-                "skills": 0,
-                "experience": 0,
-                "projects": 0
-            },
-            "matched_skills": [],
-            "missing_skills": [],
-            "suggestions": [safety_error]
-        }
-
-    # 2. Technical Signal Validation on JD
-    tech_error = validate_technical_signal(jd_data)
-    if tech_error:
-        return {
-            "final_score": 0,
-            "match_level": "Invalid Job Description",
-            "score_breakdown": {
-                "skills": 0,
-                "experience": 0,
-                "projects": 0
-            },
-            "matched_skills": [],
-            "missing_skills": [],
-            "suggestions": [tech_error]
-        }
-
-    resume_content = await resume_parser(file)
-    
-    # 2. Document-Type Validation on Resume Content
-    doc_type_error = validate_document_type(resume_content)
-    if doc_type_error:
-        return {
-            "final_score": 0,
-            "match_level": "Invalid Document Type",
-            "score_breakdown": {
-                "skills": 0,
-                "experience": 0,
-                "projects": 0
-            },
-            "matched_skills": [],
-            "missing_skills": [],
-            "suggestions": [doc_type_error]
-        }
-
-    sections = section_splitter(resume_content)
-    jd_skills = extract_skills(jd_data)
-
-    skills_keywords = extract_skills(sections["skills"])
-
-    experience_skills = extract_skills(sections["experience"])
-    experience_actions = extract_actions(sections["experience"])
-
-    projects_skills = extract_skills(sections["projects"])
-    projects_actions = extract_actions(sections["projects"])
-
-    skills_score = skills_scoring(skills_keywords, jd_skills)
-    experience_score = experience_scoring(experience_skills, experience_actions, jd_skills)
-    projects_score = project_scoring(projects_skills, projects_actions, jd_skills)
-    final_score = calculate_final_score(skills_score, experience_score, projects_score, jd_skills, skills_keywords, experience_skills, projects_skills)
-    
-    # Save to Database
-    try:
-        missing_skills_json = json.dumps(final_score["skills_missing_everywhere"])
-        new_eval = Evaluation(
-            user_email=email,
-            final_score=final_score["final_score"],
-            missing_skills=missing_skills_json
-        )
-        db.add(new_eval)
-        db.commit()
-    except Exception as e:
-        print(f"Failed to save evaluation: {e}")
-        # Don't fail the request if saving stats fails, just log it.
+    evaluation_limiter.check(client_key(client_host(request)))
 
-    return {
-        "final_score": final_score["final_score"],
-        "match_level": final_score["match_level"], 
-        "score_breakdown": {
-            "skills": skills_score["score"],
-            "experience": experience_score["score"],
-            "projects": projects_score["score"]
-        },
-        "matched_skills": skills_score["matched_skills"],
-        "missing_skills": final_score["skills_missing_everywhere"],
-        "suggestions": generate_suggestions(
-            final_score["final_score"],
-            final_score["skills_missing_everywhere"]
+    if async_mode:
+        with evaluation_gate.admit():
+            return await queue_evaluation(file, jd_data, job_id, email, callback_url)
+
+    with evaluation_gate.admit():
+        # 1. Safety & Technical Signal validation on JD (cached per normalized JD,
+        #    or precomputed when the JD was posted to /jobs)
+        if job_id is not None:
+            jd_analysis = await job_analysis_async(job_id)
+            if jd_analysis is None:
+                raise HTTPException(status_code=404, detail="Job not found")
+        else:
+            jd_analysis = await analyze_job_description_async(jd_data)
+        if jd_analysis["rejection"]:
+            count_rejection(jd_analysis["rejection"])
+            return jd_analysis["rejection"]
+
+        try:
+            upload = await spool_upload(file)
+        except DocumentTooLarge as e:
+            raise HTTPException(status_code=413, detail=str(e))
+
+        # 2. Identical submissions in flight (double clicks) share one evaluation
+        #    and store one row; see services/coalescing.py
+        jd = jd_key(jd_data, job_id)
+        task, started = evaluation_coalescer.task(
+            (email, upload.digest, jd),
+            lambda: evaluate_upload(upload, jd_analysis, email, jd)
         )
-    }
+        try:
+            return await asyncio.shield(task)
+        except DocumentTooLarge as e:
+            raise HTTPException(status_code=413, detail=str(e))
+        finally:
+            if not started:
+                upload.remove() # The shared task reads the first request's copy
+
+
+async def evaluate_upload(upload: SpooledUpload, jd_analysis: dict, email: str, jd: str) -> dict:
+    # Parse, Document-Type Validation and extraction (cached per PDF hash)
+    try:
+        resume_analysis = await analyze_resume_async(upload)
+    finally:
+        upload.remove()
+
+    if resume_analysis["rejection"]:
+        count_rejection(resume_analysis["rejection"])
+        return resume_analysis["rejection"]
+
+    result = score_resume(resume_analysis, jd_analysis["skills"])
+    if email:
+        # What changed since this user's last upload against the same JD
+        delta = revision_delta(email, jd, resume_analysis, result)
+        if delta:
+            result["delta"] = delta
+
+    # Save to Database (write-behind: batched off the request path)
+    save_evaluation(email, result)
+
+    return result
+
+
+async def queue_evaluation(file: UploadFile, jd_data: str, job_id: int, email: str, callback_url: str):
+    """
+    /evaluate?async=1: stores the request in the evaluation queue and answers 202
+    with its id at once. Poll GET /evaluations/{id}, or pass callback_url.
+    """
+    if callback_url:
+        error = await run_in_threadpool(callback_error, callback_url)
+        if error:
+            raise HTTPException(status_code=400, detail=error)
+
+    try:
+        upload = await spool_upload(file)
+    except DocumentTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+    def enqueue():
+        with SessionLocal() as db:
+            if queue_full(db):
+                raise HTTPException(status_code=503, detail="Evaluation queue is full, please retry", headers={"Retry-After": "30"})
+            with open(upload.path, "rb") as f:
+                resume = f.read()
+            if job_id is not None and get_job_profile(db, job_id) is None:
+                return None
+            return enqueue_evaluation(db, file.filename, resume, jd_data, job_id, email, callback_url)
+
+    try:
+        evaluation_id = await run_in_threadpool(enqueue)
+    finally:
+        upload.remove()
+    if evaluation_id is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return JSONResponse(
+        status_code=202,
+        content={"id": evaluation_id, "status": "queued", "status_url": f"/evaluations/{evaluation_id}"}
+    )
+
+
+@app.get("/evaluations/{evaluation_id}")
+def get_evaluation(evaluation_id: int, db: Session = Depends(get_db)):
+    # status is queued, running, done (with the /evaluate response as "result") or failed (with "error")
+    status = evaluation_status(db, evaluation_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Evaluation not found")
+    return status
+
+
+@app.post("/evaluate/batch")
+async def evaluate_resume_batch(
+    request: Request,
+    jd_data: str = Form(...),
+    files: List[UploadFile] = File(...),
+    email: str = Form(None), # Optional email
+):
+    """
+    Scores many resumes against one JD and streams one JSON object per resume
+    (NDJSON), in upload order, as each chunk finishes.
+    """
+    evaluation_limiter.check(client_key(client_host(request)), cost=len(files))
+
+    # Held until the stream is done, not just until the handler returns.
+    batch_gate.enter()
+    uploads = []
+    try:
+        for file in files:
+            if not file.filename.endswith(".pdf"):
+                uploads.append((file.filename, "Only PDF resumes are supported"))
+                continue
+            try:
+                uploads.append((file.filename, await spool_upload(file)))
+            except DocumentTooLarge as e:
+                uploads.append((file.filename, str(e)))
+    except BaseException:
+        end_batch(uploads)
+        raise
+
+    pdfs = [(name, upload) for name, upload in uploads if isinstance(upload, SpooledUpload)]
+
+    def stream():
+        results = evaluate_batch(jd_data, pdfs, pool=cpu_pool())
+        try:
+            for name, upload in uploads:
+                if not isinstance(upload, SpooledUpload):
+                    result = {"filename": name, "status": "error", "error": upload}
+                else:
+                    result = next(results)
+                    if result["status"] == "scored":
+                        save_evaluation(email, result)
+                yield json.dumps(result) + "\n"
+        finally:
+            done()
+
+    body = stream()
+    # Runs once: when the stream finishes, or when it is dropped without ever
+    # starting (the client went away), which a generator's finally can't catch.
+    done = weakref.finalize(body, end_batch, uploads)
+    return StreamingResponse(body, media_type="application/x-ndjson")
+
+
+def end_batch(uploads: list) -> None:
+    for _, upload in uploads:
+        if isinstance(upload, SpooledUpload):
+            upload.remove()
+    batch_gate.leave()
+
+
+@app.post("/evaluate/rank")
+async def rank_resumes(
+    request: Request,
+    jd_data: str = Form(...),
+    files: List[UploadFile] = File(...),
+    top_k: int = Form(50),
+):
+    """
+    Ranks many resumes against one JD with the vectorized scorer and returns
+    only the top_k, best first.
+    """
+    evaluation_limiter.check(client_key(client_host(request)), cost=len(files))
+
+    pdfs = []
+    try:
+        with batch_gate.admit():
+            for file in files:
+                if not file.filename.endswith(".pdf"):
+                    continue
+                try:
+                    pdfs.append((file.filename, await spool_upload(file)))
+                except DocumentTooLarge:
+                    continue # Oversized files are left out of the ranking
+
+            return await run_in_threadpool(rank_batch, jd_data, pdfs, top_k, pool=cpu_pool())
+    finally:
+        for _, upload in pdfs:
+            upload.remove()
 
-def generate_suggestions(final_score: int, missing_skills: list) -> list:
-    suggestions = []
 
-    if final_score < 50:
-        suggestions.append("Strengthen alignment with the job description by focusing on core required skills.")
-    elif final_score < 70:
-        suggestions.append("Good profile overall. Adding the missing skills can improve your match.")
-    else:
-        suggestions.append("Strong match for the role. Minor improvements can further strengthen your profile.")
+def client_host(request: Request) -> str:
+    return request.client.host if request.client else "unknown"
 
-    for skill in missing_skills:
-        suggestions.append(f"Consider adding experience or projects demonstrating {skill}.")
 
-    return suggestions
+def save_evaluation(email: str, result: dict) -> None:
+    evaluation_writer.submit(email, result["final_score"], result["missing_skills"])
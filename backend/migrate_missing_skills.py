@@ -0,0 +1,79 @@
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from database import engine, Base, SessionLocal
+from models import Evaluation, EvaluationMissingSkill, SkillRollup, DailyRollup
+from services.evaluation_store import add_to_rollups
+import json
+import sys
+
+BATCH_SIZE = 5000
+
+def migrate():
+    """
+    Creates the normalized missing-skill and rollup tables and backfills them from
+    the JSON strings in evaluations.missing_skills. Safe to re-run: the derived
+    tables are rebuilt from scratch. Run it with the API stopped so no evaluation
+    is written while the rollups are being rebuilt.
+    """
+    print("Creating tables...")
+    Base.metadata.create_all(bind=engine)
+
+    db = SessionLocal()
+    try:
+        print("Clearing derived tables...")
+        db.query(EvaluationMissingSkill).delete()
+        db.query(SkillRollup).delete()
+        db.query(DailyRollup).delete()
+        db.commit()
+
+        skill_counts = Counter()
+        daily_totals = defaultdict(lambda: [0, 0])
+        last_id = 0
+        migrated = 0
+
+        while True:
+            batch = (
+                db.query(Evaluation.id, Evaluation.final_score, Evaluation.missing_skills, Evaluation.created_at)
+                .filter(Evaluation.id > last_id)
+                .order_by(Evaluation.id)
+                .limit(BATCH_SIZE)
+                .all()
+            )
+            if not batch:
+                break
+
+            rows = []
+            for evaluation_id, final_score, missing_skills, created_at in batch:
+                try:
+                    skills = set(json.loads(missing_skills)) if missing_skills else set()
+                except Exception:
+                    skills = set() # Ignore parsing errors, as the old stats query did
+                rows.extend({"evaluation_id": evaluation_id, "skill": skill} for skill in skills)
+                skill_counts.update(skills)
+
+                # The rollups feed the average score; rows without one stay out of it, as with AVG()
+                if final_score is not None:
+                    day = (created_at or datetime.now(timezone.utc)).date()
+                    daily_totals[day][0] += 1
+                    daily_totals[day][1] += final_score
+
+            if rows:
+                db.bulk_insert_mappings(EvaluationMissingSkill, rows)
+            db.commit()
+
+            last_id = batch[-1][0]
+            migrated += len(batch)
+            print(f"Backfilled {migrated} evaluations...")
+
+        add_to_rollups(db, skill_counts, {day: tuple(totals) for day, totals in daily_totals.items()})
+        db.commit()
+        print(f"Done: {migrated} evaluations, {len(skill_counts)} distinct missing skills, {len(daily_totals)} days.")
+    except Exception as e:
+        db.rollback()
+        print(f"Error migrating missing skills: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    migrate()
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, BigInteger, String, Text, LargeBinary, DateTime, Date, ForeignKey
 from sqlalchemy.sql import func
 from database import Base
 
@@ -22,3 +22,74 @@ class Evaluation(Base):
     # Postgres supports JSON, but ensuring compat. String is safest for quick MVP.
     missing_skills = Column(String) # Stored as comma-separated string or JSON string
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class EvaluationMissingSkill(Base):
+    # One row per skill an evaluation reported missing, so stats can GROUP BY skill in SQL
+    __tablename__ = "evaluation_missing_skills"
+
+    evaluation_id = Column(Integer, ForeignKey("evaluations.id", ondelete="CASCADE"), primary_key=True)
+    skill = Column(String, primary_key=True, index=True)
+
+class SkillRollup(Base):
+    # Running count of evaluations missing each skill, updated on every insert
+    __tablename__ = "skill_rollups"
+
+    skill = Column(String, primary_key=True)
+    missing_count = Column(Integer, nullable=False, default=0, index=True)
+
+class DailyRollup(Base):
+    # Running evaluation count and score sum per day (UTC)
+    __tablename__ = "daily_rollups"
+
+    day = Column(Date, primary_key=True)
+    evaluation_count = Column(Integer, nullable=False, default=0)
+    score_sum = Column(BigInteger, nullable=False, default=0)
+
+class JobProfile(Base):
+    # A JD validated and extracted once (POST /jobs), then evaluated against by id
+    __tablename__ = "job_profiles"
+
+    id = Column(Integer, primary_key=True, index=True)
+    jd_hash = Column(String, unique=True, index=True, nullable=False) # SHA-256 of the normalized JD text
+    jd_text = Column(Text, nullable=False) # Kept so the profile can be rebuilt for a new taxonomy
+    taxonomy_version = Column(String, nullable=False)
+    skills = Column(Text, nullable=False) # JSON list of canonical skills
+    rejection = Column(Text, nullable=True) # JSON rejection response, NULL if the JD is valid
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class Candidate(Base):
+    # A stored resume's extracted findings (POST /candidates), searchable per JD
+    # through the in-memory index in services/candidate_pool.py. Only rows of the
+    # current taxonomy version are searched; uploading the PDF again refreshes a stale one.
+    __tablename__ = "candidates"
+
+    id = Column(Integer, primary_key=True, index=True)
+    digest = Column(String, unique=True, index=True, nullable=False) # SHA-256 of the PDF
+    filename = Column(String)
+    uploaded_by = Column(String, index=True, nullable=True)
+    skills = Column(Text, nullable=False) # JSON {section: [skills]}
+    actions = Column(Text, nullable=False) # JSON {section: [actions]}
+    taxonomy_version = Column(String, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class EvaluationJob(Base):
+    # A queued /evaluate?async=1 request; workers claim rows from here (services/evaluation_queue.py)
+    __tablename__ = "evaluation_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    status = Column(String, nullable=False, default="queued", index=True) # queued, running, done or failed
+    user_email = Column(String, nullable=True)
+    filename = Column(String)
+    jd_key = Column(String, nullable=False, index=True) # Jobs with the same key share one JD analysis
+    jd_text = Column(Text, nullable=True)
+    job_id = Column(Integer, nullable=True) # A stored JD profile, instead of jd_text
+    resume = Column(LargeBinary, nullable=True) # The PDF, cleared once the job finishes
+    callback_url = Column(String, nullable=True)
+    result = Column(Text, nullable=True) # JSON evaluation response
+    error = Column(String, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    claimed_by = Column(String, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
@@ -0,0 +1,17 @@
+import hmac
+import os
+from fastapi import Header, HTTPException
+
+# Shared secret for the admin routes that change state (roles, taxonomy, caches),
+# sent as the X-Admin-Token header. Unset disables those routes.
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+
+def require_admin(x_admin_token: str = Header(None)) -> None:
+    """
+    FastAPI dependency for admin-only routes: 403 unless the request carries ADMIN_TOKEN.
+    """
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin API is disabled (ADMIN_TOKEN not set)")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token.encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="Admin token required")
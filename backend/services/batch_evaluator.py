@@ -0,0 +1,204 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator
+from services.resume_parser import extract_text, SpooledUpload, DocumentTooLarge
+from services.result_cache import resume_cache, content_hash
+from services.calculate_final_score import match_level
+from services.vector_scoring import ResumeMatrix, score_matrix, top_k
+from services.metrics import collect, record, count_rejection
+from services.executors import submit_cpu
+from services.evaluation_pipeline import (
+    analyze_job_description, parsed_resume, parsed_key, resume_analysis_key,
+    analyze_parsed_resumes, cached_sections, store_sections, score_resume,
+)
+
+BATCH_SIZE = int(os.getenv("BATCH_EVAL_CHUNK_SIZE", "32"))
+PARSE_WORKERS = int(os.getenv("BATCH_EVAL_WORKERS", "0")) or None  # None -> one per core
+
+
+def _chunks(items: Iterable, size: int) -> Iterator[list]:
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def evaluate_batch(
+    jd_data: str,
+    resumes: Iterable,
+    workers: int = PARSE_WORKERS,
+    batch_size: int = BATCH_SIZE,
+    pool: ProcessPoolExecutor = None
+) -> Iterator[dict]:
+    """
+    Scores many resumes against one JD.
+
+    `resumes` yields (filename, source) pairs, where source is the PDF's bytes or a
+    SpooledUpload. The JD is validated and its skills extracted once (see
+    analyze_resumes for how the resumes are processed). Results are yielded in input
+    order, one dict per resume, as soon as their chunk is done; each carries a
+    "status" of "scored", "rejected" or "error".
+    """
+    jd_analysis = analyze_job_description(jd_data, pool)
+    if jd_analysis["rejection"]:
+        count_rejection(jd_analysis["rejection"])
+        for filename, _ in resumes:
+            yield {"filename": filename, "status": "rejected", **jd_analysis["rejection"]}
+        return
+
+    for item in analyze_resumes(resumes, workers, batch_size, pool):
+        analysis = item["analysis"]
+        if analysis is None:
+            yield {"filename": item["filename"], "status": "error", "error": item["error"]}
+        elif analysis["rejection"]:
+            count_rejection(analysis["rejection"])
+            yield {"filename": item["filename"], "status": "rejected", **analysis["rejection"]}
+        else:
+            yield {"filename": item["filename"], "status": "scored", **score_resume(analysis, jd_analysis["skills"])}
+
+
+def rank_batch(
+    jd_data: str,
+    resumes: Iterable,
+    k: int,
+    workers: int = PARSE_WORKERS,
+    batch_size: int = BATCH_SIZE,
+    pool: ProcessPoolExecutor = None
+) -> dict:
+    """
+    Ranks many resumes against one JD and returns only the top `k`. Scores come
+    from the vectorized engine, so no per-resume response is built for the rest.
+    Returns the JD's rejection response if it fails validation.
+    """
+    jd_analysis = analyze_job_description(jd_data, pool)
+    if jd_analysis["rejection"]:
+        count_rejection(jd_analysis["rejection"])
+        return jd_analysis["rejection"]
+
+    filenames = []
+    analyses = []
+    total = 0
+    for item in analyze_resumes(resumes, workers, batch_size, pool):
+        total += 1
+        if item["analysis"] is not None and not item["analysis"]["rejection"]:
+            filenames.append(item["filename"])
+            analyses.append(item["analysis"])
+
+    matrix = ResumeMatrix(analyses)
+    scores = score_matrix(matrix, jd_analysis["skills"])
+
+    ranked = []
+    for row, final_score in top_k(matrix, jd_analysis["skills"], k, scores):
+        ranked.append({
+            "filename": filenames[row],
+            "final_score": final_score,
+            "match_level": match_level(final_score),
+            "score_breakdown": {
+                "skills": int(scores["skills"][row]),
+                "experience": int(scores["experience"][row]),
+                "projects": int(scores["projects"][row])
+            }
+        })
+
+    return {"total": total, "scored": len(analyses), "ranked": ranked}
+
+
+def analyze_resumes(
+    resumes: Iterable,
+    workers: int = PARSE_WORKERS,
+    batch_size: int = BATCH_SIZE,
+    pool: ProcessPoolExecutor = None
+) -> Iterator[dict]:
+    """
+    Analyzes (filename, source) pairs in input order, yielding
+    {"filename", "analysis", "error"} per resume, where analysis is an
+    analyze_resume() result or None if the PDF could not be read.
+
+    PDFs are parsed in a process pool, one chunk ahead of the spaCy stage, which runs
+    in the same pool with one nlp.pipe stream per chunk; this process only hashes,
+    looks up caches and waits. Resumes already in the result cache skip both stages. Pass `pool` to reuse an existing process pool instead of
+    starting `workers` new processes.
+    """
+    if pool is None:
+        with ProcessPoolExecutor(max_workers=workers) as own_pool:
+            yield from _analyze_chunks(own_pool, resumes, batch_size)
+    else:
+        yield from _analyze_chunks(pool, resumes, batch_size)
+
+
+def _analyze_chunks(pool: ProcessPoolExecutor, resumes: Iterable, batch_size: int) -> Iterator[dict]:
+    pending = None
+    for chunk in _chunks(resumes, batch_size):
+        submitted = [_submit(pool, filename, source) for filename, source in chunk]
+        if pending:
+            yield from _analyze_chunk(pool, pending)
+        pending = submitted
+    if pending:
+        yield from _analyze_chunk(pool, pending)
+
+
+def _submit(pool: ProcessPoolExecutor, filename: str, source) -> dict:
+    if isinstance(source, SpooledUpload):
+        digest, source = source.digest, source.path
+    else:
+        digest = content_hash(source)
+    item = {"filename": filename, "digest": digest, "error": None}
+
+    item["analysis"] = resume_cache.get(resume_analysis_key(digest))
+    if item["analysis"] is None:
+        item["parsed"] = resume_cache.get(parsed_key(digest))
+        if item["parsed"] is None:
+            # collect() brings the worker's stage timings back with the text
+            item["future"] = pool.submit(collect, extract_text, source)
+
+    return item
+
+
+def _analyze_chunk(pool: ProcessPoolExecutor, items: list) -> Iterator[dict]:
+    to_analyze = []
+
+    for item in items:
+        if item["analysis"] is not None:
+            continue
+
+        if item["parsed"] is None:
+            try:
+                text, observations = item["future"].result()
+                record(observations)
+                item["parsed"] = parsed_resume(text)
+            except DocumentTooLarge as e:
+                item["error"] = str(e)
+                continue
+            except Exception as e:
+                print(f"Failed to parse {item['filename']}: {e}")
+                item["error"] = "Could not read PDF"
+                continue
+            resume_cache.set(parsed_key(item["digest"]), item["parsed"])
+
+        to_analyze.append(item)
+
+    if to_analyze:
+        # Validation and one nlp.pipe stream for the uncached sections of every
+        # resume in the chunk, in a pool child; the section cache lives here.
+        parsed = [item["parsed"] for item in to_analyze]
+        try:
+            analyses, observations = submit_cpu(pool, analyze_parsed_resumes, parsed, [cached_sections(p) for p in parsed]).result()
+            record(observations)
+        except Exception as e:
+            print(f"Failed to analyze {len(to_analyze)} resumes: {e}")
+            analyses = [None] * len(to_analyze)
+
+        for item, analysis in zip(to_analyze, analyses):
+            if analysis is None:
+                item["error"] = "Could not analyze resume"
+                continue
+            store_sections(analysis)
+            item["analysis"] = analysis
+            resume_cache.set(resume_analysis_key(item["digest"]), item["analysis"])
+
+    for item in items:
+        yield {"filename": item["filename"], "analysis": item["analysis"], "error": item["error"]}
@@ -1,16 +1,28 @@
+from services.metrics import stage
+from services.score_results import SectionScore, FinalScore
+
+def match_level(total_score: int) -> str:
+    if total_score >= 80:
+        return "High"
+    elif total_score >= 50:
+        return "Medium"
+    return "Low"
+
+
+@stage("score_final")
 def calculate_final_score(
-    skill_score: dict,
-    experience_score: dict,
-    project_score: dict,
+    skill_score: SectionScore,
+    experience_score: SectionScore,
+    project_score: SectionScore,
     jd_skills: set,
     resume_skills: set,
     experience_skills: set,
     project_skills: set
-) -> dict:
+) -> FinalScore:
     total_score = (
-        skill_score["score"]
-        + experience_score["score"]
-        + project_score["score"]
+        skill_score.score
+        + experience_score.score
+        + project_score.score
     )
 
     total_score = min(total_score, 100)
@@ -22,20 +34,4 @@ def calculate_final_score(
         - project_skills
     )
 
-    match_level = "Low"
-    if total_score >= 80:
-        match_level = "High"
-    elif total_score >= 50:
-        match_level = "Medium"
-
-    return {
-        "final_score": total_score,
-        "match_level": match_level,
-        "breakdown": {
-            "skills": skill_score,
-            "experience": experience_score,
-            "projects": project_score,
-        },
-
-        "skills_missing_everywhere": sorted(list(missing_everywhere))
-    }
+    return FinalScore(total_score, match_level(total_score), missing_everywhere)
@@ -0,0 +1,75 @@
+import ipaddress
+import os
+import socket
+import time
+from typing import Optional
+from urllib.parse import urlsplit
+import requests
+
+CALLBACK_TIMEOUT = float(os.getenv("CALLBACK_TIMEOUT", "5"))
+CALLBACK_ATTEMPTS = int(os.getenv("CALLBACK_ATTEMPTS", "3"))
+# Callback hosts allowed even on private addresses, comma-separated ("hooks.internal",
+# ".example.com" for its subdomains). Other hosts must resolve to public addresses only.
+CALLBACK_ALLOWED_HOSTS = [
+    host.strip().lower()
+    for host in os.getenv("CALLBACK_ALLOWED_HOSTS", "").split(",")
+    if host.strip()
+]
+
+
+def _allowed_host(host: str) -> bool:
+    return any(
+        host == allowed or (allowed.startswith(".") and host.endswith(allowed))
+        for allowed in CALLBACK_ALLOWED_HOSTS
+    )
+
+
+def callback_error(url: str) -> Optional[str]:
+    """
+    Why the server must not POST to `url`, or None. Refuses non-http(s) URLs and,
+    unless the host is in CALLBACK_ALLOWED_HOSTS, hosts resolving to loopback,
+    private, link-local or other non-public addresses. Resolves DNS (blocking).
+    """
+    try:
+        parts = urlsplit(url)
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+    except ValueError:
+        return "callback_url is not a valid URL"
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        return "callback_url must be an http(s) URL"
+
+    host = parts.hostname.lower()
+    if _allowed_host(host):
+        return None
+
+    try:
+        addresses = {info[4][0] for info in socket.getaddrinfo(host, port, proto=socket.IPPROTO_TCP)}
+    except (OSError, UnicodeError):
+        return "callback_url host does not resolve"
+    for address in addresses:
+        ip = ipaddress.ip_address(address.split("%")[0])
+        if not ip.is_global or ip.is_multicast:
+            return "callback_url must point to a public address"
+
+    return None
+
+
+def notify_callback(url: str, payload: dict) -> None:
+    # Checked again at send time: the host's DNS may have changed since the request.
+    error = callback_error(url)
+    if error:
+        print(f"Refusing callback for evaluation {payload['id']}: {error}")
+        return
+
+    # Best-effort: a few tries, then the client can still poll GET /evaluations/{id}.
+    for attempt in range(CALLBACK_ATTEMPTS):
+        try:
+            # No redirects: they could lead anywhere the check above refused.
+            response = requests.post(url, json=payload, timeout=CALLBACK_TIMEOUT, allow_redirects=False)
+            if response.status_code < 500:
+                return
+        except requests.RequestException as e:
+            print(f"Callback to {url} failed: {e}")
+        if attempt + 1 < CALLBACK_ATTEMPTS:
+            time.sleep(2 ** attempt)
+    print(f"Giving up on callback for evaluation {payload['id']}")
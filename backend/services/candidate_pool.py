@@ -0,0 +1,192 @@
+import os
+import threading
+from array import array
+import numpy as np
+from services.evaluation_pipeline import SCORED_SECTIONS
+from services.vector_scoring import score_arrays
+
+# How far below the highest loaded id a refresh looks for rows that committed out of order.
+CATCHUP_WINDOW = int(os.getenv("CANDIDATE_CATCHUP_WINDOW", "1000"))
+
+# A resume that shares no skill with the JD scores on four flags alone; they are
+# packed into one small "class" code per resume.
+HAS_EXPERIENCE, EXPERIENCE_ACTIONS, HAS_PROJECTS, PROJECT_ACTIONS = 8, 4, 2, 1
+CLASS_CODES = np.arange(16, dtype=np.uint8)
+# Above total/DENSE_FRACTION postings a query counts matches with one bincount per section.
+DENSE_FRACTION = 16
+
+
+def candidate_class(analysis: dict) -> int:
+    skills, actions = analysis["skills"], analysis["actions"]
+    return (
+        (HAS_EXPERIENCE if skills["experience"] or actions["experience"] else 0)
+        | (EXPERIENCE_ACTIONS if actions["experience"] else 0)
+        | (HAS_PROJECTS if skills["projects"] or actions["projects"] else 0)
+        | (PROJECT_ACTIONS if actions["projects"] else 0)
+    )
+
+
+def _flags(codes: np.ndarray) -> tuple:
+    # (has_experience, has_projects, experience_actions, project_actions), as score_arrays takes them
+    return tuple((codes & flag) != 0 for flag in (HAS_EXPERIENCE, HAS_PROJECTS, EXPERIENCE_ACTIONS, PROJECT_ACTIONS))
+
+
+def _best(final: np.ndarray, ids: np.ndarray, k: int) -> np.ndarray:
+    """
+    Positions of the k best entries (score desc, then id asc), unordered, without
+    sorting everything: all entries above the k-th score, plus the lowest ids tied with it.
+    """
+    if len(final) <= k:
+        return np.arange(len(final))
+
+    cutoff = np.partition(final, len(final) - k)[len(final) - k]
+    above = np.flatnonzero(final > cutoff)
+    tied = np.flatnonzero(final == cutoff)
+    need = k - len(above)
+    if len(tied) > need:
+        tied = tied[np.argpartition(ids[tied], need - 1)[:need]]
+
+    return np.concatenate([above, tied])
+
+
+class CandidateIndex:
+    """
+    Inverted index over stored resumes: per section, skill -> postings (row numbers),
+    plus each resume's id and class code. Queries score only the resumes that share
+    a JD skill, with the same formulas as the scalar scorers, and take the resumes
+    that share none from the per-class scores.
+    """
+
+    def __init__(self, version: str = None):
+        self._lock = threading.Lock()
+        self._clear(version)
+
+    def _clear(self, version: str) -> None:
+        self.version = version # taxonomy version of every loaded analysis
+        self._ids = array("q")
+        self._classes = bytearray()
+        self._postings = {section: {} for section in SCORED_SECTIONS}
+        self._max_id = 0
+        self._recent = set() # loaded ids within CATCHUP_WINDOW of _max_id
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def reset(self, version: str) -> None:
+        # Empties the index, to be reloaded with the analyses of another taxonomy version.
+        with self._lock:
+            self._clear(version)
+
+    def add(self, candidate_id: int, analysis: dict) -> None:
+        with self._lock:
+            self._add(candidate_id, analysis)
+
+    def _add(self, candidate_id: int, analysis: dict) -> None:
+        if candidate_id in self._recent:
+            return
+
+        row = len(self._ids)
+        self._ids.append(candidate_id)
+        self._classes.append(candidate_class(analysis))
+        for section in SCORED_SECTIONS:
+            postings = self._postings[section]
+            for skill in analysis["skills"][section]:
+                postings.setdefault(skill, array("i")).append(row)
+
+        self._max_id = max(self._max_id, candidate_id)
+        self._recent.add(candidate_id)
+        if len(self._recent) > 2 * CATCHUP_WINDOW:
+            self._recent = {id for id in self._recent if id > self._max_id - CATCHUP_WINDOW}
+
+    def add_many(self, candidates: list) -> None:
+        # [(id, analysis)], under one lock acquisition
+        with self._lock:
+            for candidate_id, analysis in candidates:
+                self._add(candidate_id, analysis)
+
+    def catchup_floor(self) -> int:
+        # Ids above this may still be missing: new ones, or ones that committed out of order.
+        return max(self._max_id - CATCHUP_WINDOW, 0)
+
+    def has(self, candidate_id: int) -> bool:
+        # Only meaningful for ids above catchup_floor().
+        return candidate_id in self._recent
+
+    def top(self, jd_skills: set, k: int) -> dict:
+        """
+        The k best candidates for a JD's skill set, highest score first and ties by
+        id. Returns {"total", "considered", "ranked": [(id, final, skills, experience,
+        projects)]}, where "considered" counts the resumes sharing a JD skill.
+        """
+        with self._lock:
+            total = len(self._ids)
+            if not total or k <= 0:
+                return {"total": total, "considered": 0, "ranked": []}
+
+            # Copies: no numpy view may outlive the lock, or appends would fail.
+            section_rows = {
+                section: [np.frombuffer(postings[skill], dtype=np.int32).copy() for skill in jd_skills if skill in postings]
+                for section, postings in self._postings.items()
+            }
+            ids = np.frombuffer(self._ids, dtype=np.int64).copy()
+            classes = np.frombuffer(bytes(self._classes), dtype=np.uint8)
+
+        hits = [rows for section in section_rows.values() for rows in section]
+        if sum(map(len, hits)) > total // DENSE_FRACTION:
+            # Most of the pool shares a skill: count per row directly instead of sorting postings.
+            dense = {
+                section: np.bincount(np.concatenate(rows), minlength=total) if rows else np.zeros(total, dtype=np.int64)
+                for section, rows in section_rows.items()
+            }
+            shared = np.flatnonzero(sum(dense.values()))
+            matched = {section: counts[shared] for section, counts in dense.items()}
+        else:
+            shared = np.unique(np.concatenate(hits)) if hits else np.empty(0, dtype=np.int64)
+            matched = {}
+            for section, rows in section_rows.items():
+                counts = np.zeros(len(shared), dtype=np.int64)
+                if rows:
+                    found, per_row = np.unique(np.concatenate(rows), return_counts=True)
+                    counts[np.searchsorted(shared, found)] = per_row
+                matched[section] = counts
+
+        scores = score_arrays(len(jd_skills), matched["skills"], matched["experience"], matched["projects"], *_flags(classes[shared]))
+        rows, parts = [shared], [scores]
+
+        # Resumes sharing no skill score the same within a class, so each class
+        # only contributes its k lowest ids, and only if it can reach the top k.
+        zeros = np.zeros(len(CLASS_CODES), dtype=np.int64)
+        class_scores = score_arrays(len(jd_skills), zeros, zeros, zeros, *_flags(CLASS_CODES))
+        cutoff = np.partition(scores["final"], len(shared) - k)[len(shared) - k] if len(shared) >= k else -1
+        present = np.bincount(classes, minlength=len(CLASS_CODES))
+
+        for code in CLASS_CODES:
+            if not present[code] or class_scores["final"][code] < cutoff:
+                continue
+            members = np.flatnonzero(classes == code)
+            members = members[~np.isin(members, shared, assume_unique=True)]
+            if len(members) > k:
+                members = members[np.argpartition(ids[members], k - 1)[:k]]
+            rows.append(members)
+            parts.append({name: np.full(len(members), values[code]) for name, values in class_scores.items()})
+
+        rows = np.concatenate(rows)
+        columns = {name: np.concatenate([part[name] for part in parts]) for name in scores}
+        keep = _best(columns["final"], ids[rows], k)
+        rows, columns = rows[keep], {name: values[keep] for name, values in columns.items()}
+        order = np.lexsort((ids[rows], -columns["final"]))
+        rows, columns = rows[order], {name: values[order] for name, values in columns.items()}
+
+        return {
+            "total": total,
+            "considered": len(shared),
+            "ranked": [
+                (int(ids[row]), int(score), int(skills), int(experience), int(projects))
+                for row, score, skills, experience, projects in zip(
+                    rows, columns["final"], columns["skills"], columns["experience"], columns["projects"]
+                )
+            ]
+        }
+
+
+candidate_index = CandidateIndex()
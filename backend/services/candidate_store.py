@@ -0,0 +1,141 @@
+import json
+import os
+import time
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from models import Candidate
+from services.calculate_final_score import match_level
+from services.candidate_pool import candidate_index, CandidateIndex
+from services.evaluation_pipeline import SCORED_SECTIONS
+from services.taxonomy import get_taxonomy
+
+# How often a query checks the table for candidates stored by other workers.
+REFRESH_INTERVAL = float(os.getenv("CANDIDATE_REFRESH_INTERVAL", "1"))
+LOAD_BATCH = 5000
+
+_refreshed_at = {"time": float("-inf")}
+
+
+def stored_analysis(skills: str, actions: str) -> dict:
+    skills, actions = json.loads(skills), json.loads(actions)
+    return {
+        "skills": {section: frozenset(skills.get(section, ())) for section in SCORED_SECTIONS},
+        "actions": {section: frozenset(actions.get(section, ())) for section in SCORED_SECTIONS}
+    }
+
+
+def refresh_index(db: Session, index: CandidateIndex = candidate_index, force: bool = False) -> None:
+    """
+    Loads candidates stored since the last refresh, by any worker, into the index.
+    The first call, and the first after the taxonomy changed, loads the whole table;
+    candidates analyzed with another taxonomy version are left out.
+    """
+    version = get_taxonomy().version
+    if index.version != version:
+        index.reset(version)
+        force = True
+    if not force and time.monotonic() - _refreshed_at["time"] < REFRESH_INTERVAL:
+        return
+    _refreshed_at["time"] = time.monotonic()
+
+    new_ids = [
+        id for id in db.execute(
+            select(Candidate.id)
+            .where(Candidate.id > index.catchup_floor(), Candidate.taxonomy_version == version)
+            .order_by(Candidate.id)
+        ).scalars()
+        if not index.has(id)
+    ]
+    for start in range(0, len(new_ids), LOAD_BATCH):
+        rows = db.execute(
+            select(Candidate.id, Candidate.skills, Candidate.actions)
+            .where(Candidate.id.in_(new_ids[start:start + LOAD_BATCH]))
+            .order_by(Candidate.id)
+        ).all()
+        index.add_many([(id, stored_analysis(skills, actions)) for id, skills, actions in rows])
+
+
+def _apply(candidate: Candidate, analysis: dict, version: str) -> None:
+    candidate.taxonomy_version = version
+    candidate.skills = json.dumps({section: sorted(analysis["skills"][section]) for section in SCORED_SECTIONS})
+    candidate.actions = json.dumps({section: sorted(analysis["actions"][section]) for section in SCORED_SECTIONS})
+
+
+def store_candidates(db: Session, items: list, uploaded_by: str = None) -> list:
+    """
+    Stores analyzed resumes given as (filename, digest, analysis) and adds them to
+    the index. A PDF stored before (same digest) keeps its existing id; its findings
+    are replaced if they came from an older taxonomy.
+    Returns [(filename, id, stored)] in input order.
+    """
+    version = get_taxonomy().version
+    digests = {digest for _, digest, _ in items}
+    stored = db.execute(select(Candidate).where(Candidate.digest.in_(digests))).scalars().all()
+    existing = {candidate.digest: candidate.id for candidate in stored}
+
+    refreshed = []
+    for candidate in stored:
+        if candidate.taxonomy_version != version:
+            analysis = next(analysis for _, digest, analysis in items if digest == candidate.digest)
+            _apply(candidate, analysis, version)
+            refreshed.append((candidate.id, analysis))
+    if refreshed:
+        db.commit()
+
+    new = {}
+    for filename, digest, analysis in items:
+        if digest not in existing and digest not in new:
+            candidate = Candidate(digest=digest, filename=filename, uploaded_by=uploaded_by)
+            _apply(candidate, analysis, version)
+            new[digest] = (candidate, analysis)
+
+    try:
+        db.add_all([candidate for candidate, _ in new.values()])
+        db.commit()
+    except IntegrityError:
+        # Some were stored concurrently; keep theirs and store the rest one by one.
+        db.rollback()
+        for digest, (candidate, analysis) in list(new.items()):
+            try:
+                db.add(candidate)
+                db.commit()
+            except IntegrityError:
+                db.rollback()
+                del new[digest]
+        existing.update(db.execute(select(Candidate.digest, Candidate.id).where(Candidate.digest.in_(digests))).all())
+
+    if candidate_index.version == version:
+        # Otherwise the next refresh_index reloads the table, these included.
+        candidate_index.add_many(refreshed + [(candidate.id, analysis) for candidate, analysis in new.values()])
+
+    return [
+        (filename, new[digest][0].id if digest in new else existing[digest], digest in new)
+        for filename, digest, _ in items
+    ]
+
+
+def top_candidates(db: Session, jd_skills: set, k: int) -> dict:
+    """
+    The /jobs/{id}/top response: the k best stored candidates for a JD's skills.
+    """
+    refresh_index(db)
+    result = candidate_index.top(jd_skills, k)
+
+    ids = [ranked[0] for ranked in result["ranked"]]
+    filenames = dict(db.execute(select(Candidate.id, Candidate.filename).where(Candidate.id.in_(ids))).all()) if ids else {}
+
+    return {
+        "total": result["total"],
+        "considered": result["considered"],
+        "ranked": [
+            {
+                "candidate_id": id,
+                "filename": filenames.get(id),
+                "final_score": final,
+                "match_level": match_level(final),
+                "score_breakdown": {"skills": skills, "experience": experience, "projects": projects}
+            }
+            for id, final, skills, experience, projects in result["ranked"]
+        ]
+    }
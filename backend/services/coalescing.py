@@ -0,0 +1,51 @@
+import asyncio
+import os
+
+# How long a finished result is still handed to identical requests, so a double
+# submit that arrives just after the first one completed isn't evaluated (and
+# stored) again.
+COALESCE_WINDOW = float(os.getenv("COALESCE_WINDOW", "2"))
+
+
+class Coalescer:
+    """
+    Runs one task per key at a time: identical requests made while it runs (or
+    within `window` seconds after it succeeded) await the same task instead of
+    starting their own. Only used from the event loop, so a plain dict is enough.
+    """
+
+    def __init__(self, window: float = COALESCE_WINDOW):
+        self.window = window
+        self._tasks = {}
+
+    def task(self, key, factory) -> tuple:
+        """
+        Returns (task, started): the task running for `key`, or a new one from
+        `factory()` (a coroutine function), with started=True for the new one.
+        Await it through asyncio.shield(), so one caller disconnecting doesn't
+        cancel the work the others are waiting on.
+        """
+        task = self._tasks.get(key)
+        if task is not None:
+            return task, False
+
+        task = asyncio.ensure_future(factory())
+        self._tasks[key] = task
+        task.add_done_callback(lambda done: self._finished(key, done))
+        return task, True
+
+    def _finished(self, key, task) -> None:
+        if task.cancelled() or task.exception() is not None or not self.window:
+            self._forget(key, task)
+        else:
+            asyncio.get_running_loop().call_later(self.window, self._forget, key, task)
+
+    def _forget(self, key, task) -> None:
+        if self._tasks.get(key) is task:
+            del self._tasks[key]
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+
+evaluation_coalescer = Coalescer()
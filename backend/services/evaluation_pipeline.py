@@ -0,0 +1,358 @@
+import asyncio
+import hashlib
+import time
+from itertools import chain
+from typing import Optional
+from services.keywords_finder import find_skills, find_actions, extract_skills
+from services.nlp_processor import analyze_span_batch
+from services.resume_parser import (
+    extract_text, extract_unless_long, extract_page_range, join_pages, SpooledUpload,
+    PDF_PARALLEL_MIN_PAGES, PDF_PAGES_PER_TASK,
+)
+from services.section_splitter import section_spans
+from services.result_cache import resume_cache, jd_cache, section_cache, content_hash, normalize_text
+from services.taxonomy import get_taxonomy
+from services.executors import run_cpu, submit_cpu, PARSE_TIMEOUT, NLP_TIMEOUT
+from services.skills_scoring import skills_scoring
+from services.experience_scoring import experience_scoring
+from services.project_scoring import project_scoring
+from services.calculate_final_score import calculate_final_score
+from services.metrics import stage, observe, record, stage_seconds
+from services.validators import validate_document_type, validate_job_description
+
+# Resume sections that feed the scorers.
+SCORED_SECTIONS = ("skills", "experience", "projects")
+
+
+def rejection(match_level: str, message: str) -> dict:
+    return {
+        "final_score": 0,
+        "match_level": match_level,
+        "score_breakdown": {
+            "skills": 0,
+            "experience": 0,
+            "projects": 0
+        },
+        "matched_skills": [],
+        "missing_skills": [],
+        "suggestions": [message]
+    }
+
+
+@stage("validate")
+def check_job_description(jd_data: str) -> Optional[dict]:
+    """
+    Runs the JD through the safety and technical-signal validators.
+    Returns the rejection response, or None if the JD can be scored against.
+    """
+    # Both verdicts come from one scan of the normalized text, the text the JD cache
+    # and job profiles are keyed on: a phrase broken across lines is still found.
+    safety_error, tech_error = validate_job_description(normalize_text(jd_data))
+
+    # 1. Safety & Intent Filter on JD
+    if safety_error:
+        return rejection("Safety Violation", safety_error)
+
+    # 2. Technical Signal Validation on JD
+    if tech_error:
+        return rejection("Invalid Job Description", tech_error)
+
+    return None
+
+
+@stage("validate")
+def check_resume(resume_content: str) -> Optional[dict]:
+    doc_type_error = validate_document_type(resume_content)
+    if doc_type_error:
+        return rejection("Invalid Document Type", doc_type_error)
+
+    return None
+
+
+def analyze_job_description(jd_data: str, pool=None) -> dict:
+    """
+    Validates the JD and extracts its skills, cached by the hash of its normalized
+    text. Returns {"rejection": response or None, "skills": frozenset}. With a
+    process `pool`, the spaCy work runs there and this call only waits for it.
+    """
+    jd_text = normalize_text(jd_data)
+    key = f"{content_hash(jd_text)}:{get_taxonomy().version}"
+
+    analysis = jd_cache.get(key)
+    if analysis is None:
+        if pool is None:
+            analysis = job_description_findings(jd_text)
+        else:
+            analysis, observations = submit_cpu(pool, job_description_findings, jd_text).result()
+            record(observations)
+        jd_cache.set(key, analysis)
+
+    return analysis
+
+
+async def analyze_job_description_async(jd_data: str) -> dict:
+    """
+    analyze_job_description with the spaCy work done in the process pool.
+    """
+    jd_text = normalize_text(jd_data)
+    key = f"{content_hash(jd_text)}:{get_taxonomy().version}"
+
+    analysis = jd_cache.get(key)
+    if analysis is None:
+        analysis = await run_cpu(job_description_findings, jd_text, timeout=NLP_TIMEOUT, stage="JD analysis")
+        jd_cache.set(key, analysis)
+
+    return analysis
+
+
+def job_description_findings(jd_text: str) -> dict:
+    rejection = check_job_description(jd_text)
+    return {
+        "rejection": rejection,
+        "skills": frozenset() if rejection else frozenset(extract_skills(jd_text))
+    }
+
+
+def parse_resume(source, digest: str) -> dict:
+    """
+    Extracts the text of a PDF (raw bytes or a file path) and splits it into
+    sections, cached by the PDF's SHA-256.
+    """
+    parsed = resume_cache.get(parsed_key(digest))
+    if parsed is None:
+        parsed = parsed_resume(extract_text(source))
+        resume_cache.set(parsed_key(digest), parsed)
+
+    return parsed
+
+
+def parsed_resume(resume_content: str) -> dict:
+    # Sections are kept as character offsets into the text, not as copies of it.
+    return {"text": resume_content, "spans": section_spans(resume_content)}
+
+
+def parsed_key(digest: str) -> str:
+    return f"parsed:{digest}"
+
+
+def resume_analysis_key(digest: str) -> str:
+    # Skill/action sets depend on the vocabulary, so a taxonomy reload invalidates them.
+    return f"analysis:{digest}:{get_taxonomy().version}"
+
+
+def section_key(section_hash: str) -> str:
+    return f"section:{section_hash}:{get_taxonomy().version}"
+
+
+def section_hashes(parsed: dict) -> dict:
+    """
+    {section: SHA-256 of its text}, hashed range by range from the spans rather
+    than from a joined copy of each section.
+    """
+    hashes = {}
+    for name in SCORED_SECTIONS:
+        digest = hashlib.sha256()
+        for start, end in parsed["spans"][name]:
+            digest.update(parsed["text"][start:end].encode("utf-8"))
+        hashes[name] = digest.hexdigest()
+    return hashes
+
+
+def cached_sections(parsed: dict) -> dict:
+    """
+    {section: {"skills", "actions"}} for the parsed resume's sections already in the
+    section cache. Looked up in the web process, whose cache outlives any one pool child.
+    """
+    found = {}
+    for name, section_hash in section_hashes(parsed).items():
+        findings = section_cache.get(section_key(section_hash))
+        if findings is not None:
+            found[name] = findings
+    return found
+
+
+def store_sections(analysis: dict) -> None:
+    for name, section_hash in analysis.get("sections", {}).items():
+        section_cache.set(section_key(section_hash), {"skills": analysis["skills"][name], "actions": analysis["actions"][name]})
+
+
+def analyze_sections(parsed_resumes: list, known: list = None) -> list:
+    """
+    The findings of parsed resumes, section by section, in analyze_resume's shape
+    plus "sections": {section: SHA-256 of its text}. spaCy and the extractors
+    only run on the spans of sections not already known, all resumes in one
+    analyze_span_batch stream. `known` gives each resume's cached_sections();
+    without it the section cache is read and filled here.
+    """
+    pending = []
+    documents = []
+    analyses = []
+    for index, parsed in enumerate(parsed_resumes):
+        analysis = {"rejection": None, "skills": {}, "actions": {}, "sections": section_hashes(parsed)}
+        found = known[index] if known is not None else cached_sections(parsed)
+        for name in SCORED_SECTIONS:
+            if name in found:
+                analysis["skills"][name] = found[name]["skills"]
+                analysis["actions"][name] = found[name]["actions"]
+
+        spans = {name: parsed["spans"][name] for name in SCORED_SECTIONS if name not in found}
+        if spans:
+            pending.append(analysis)
+            documents.append((parsed["text"], spans))
+        analyses.append(analysis)
+
+    for analysis, tokens in zip(pending, analyze_span_batch(documents)):
+        for name, section_tokens in tokens.items():
+            analysis["skills"][name] = frozenset(find_skills(section_tokens))
+            analysis["actions"][name] = frozenset(find_actions(section_tokens))
+
+    if known is None:
+        for analysis in analyses:
+            store_sections(analysis)
+    return analyses
+
+
+def analyze_resume(contents: bytes) -> dict:
+    """
+    Parses, validates and extracts a resume PDF, cached by its SHA-256.
+    Returns {"rejection": response or None, "skills": {section: frozenset},
+    "actions": {section: frozenset}}.
+    """
+    digest = content_hash(contents)
+    key = resume_analysis_key(digest)
+
+    analysis = resume_cache.get(key)
+    if analysis is None:
+        parsed = parse_resume(contents, digest)
+        analysis = analyze_parsed_resume(parsed)
+        resume_cache.set(key, analysis)
+
+    return analysis
+
+
+async def analyze_resume_async(upload: SpooledUpload) -> dict:
+    """
+    analyze_resume for a spooled upload, with PDF parsing and spaCy each run in the
+    process pool under their own timeout, so the event loop keeps serving other
+    requests. Workers open the spooled file themselves; no bytes are pickled over.
+    """
+    digest = upload.digest
+    key = resume_analysis_key(digest)
+
+    analysis = resume_cache.get(key)
+    if analysis is not None:
+        return analysis
+
+    parsed = resume_cache.get(parsed_key(digest))
+    if parsed is None:
+        resume_content = await extract_text_async(upload.path)
+        parsed = parsed_resume(resume_content)
+        resume_cache.set(parsed_key(digest), parsed)
+
+    analysis = await run_cpu(analyze_parsed_resume, parsed, cached_sections(parsed), timeout=NLP_TIMEOUT, stage="Resume analysis")
+    store_sections(analysis)
+    resume_cache.set(key, analysis)
+
+    return analysis
+
+
+async def extract_text_async(path: str) -> str:
+    """
+    extract_text in the process pool. A PDF of PDF_PARALLEL_MIN_PAGES pages or
+    more is split into ranges of PDF_PAGES_PER_TASK pages that several workers
+    extract at once, each opening the file itself; shorter ones take one task.
+    """
+    if not PDF_PARALLEL_MIN_PAGES:
+        return await run_cpu(extract_text, path, timeout=PARSE_TIMEOUT, stage="PDF parsing")
+
+    started = time.perf_counter()
+    page_count, page_texts = await run_cpu(extract_unless_long, path, PDF_PARALLEL_MIN_PAGES, timeout=PARSE_TIMEOUT, stage="PDF parsing")
+    if page_texts is None:
+        ranges = await asyncio.gather(*(
+            run_cpu(extract_page_range, path, start, start + PDF_PAGES_PER_TASK, timeout=PARSE_TIMEOUT, stage="PDF parsing")
+            for start in range(0, page_count, PDF_PAGES_PER_TASK)
+        ))
+        page_texts = chain.from_iterable(ranges)
+
+    text = join_pages(page_texts)
+    # Wall time; the per-page histogram has the time each worker spent.
+    observe(stage_seconds.name, time.perf_counter() - started, "parse")
+    return text
+
+
+def analyze_parsed_resume(parsed: dict, known: dict = None) -> dict:
+    # Sections in `known` (see cached_sections) are not analyzed again.
+    return analyze_parsed_resumes([parsed], None if known is None else [known])[0]
+
+
+def analyze_parsed_resumes(parsed_resumes: list, known: list = None) -> list:
+    """
+    analyze_parsed_resume over many resumes; the ones that pass validation share
+    one analyze_sections stream.
+    """
+    analyses = [None] * len(parsed_resumes)
+    accepted = []
+    for index, parsed in enumerate(parsed_resumes):
+        # Document-Type Validation on Resume Content
+        rejection = check_resume(parsed["text"])
+        if rejection:
+            analyses[index] = {"rejection": rejection}
+        else:
+            accepted.append(index)
+
+    found = analyze_sections(
+        [parsed_resumes[index] for index in accepted],
+        None if known is None else [known[index] for index in accepted]
+    )
+    for index, analysis in zip(accepted, found):
+        analyses[index] = analysis
+    return analyses
+
+
+def score_resume(analysis: dict, jd_skills: set) -> dict:
+    """
+    Scores an analyzed resume (see analyze_resume) and builds the /evaluate response.
+    """
+    skills_keywords = analysis["skills"]["skills"]
+
+    experience_skills = analysis["skills"]["experience"]
+    experience_actions = analysis["actions"]["experience"]
+
+    projects_skills = analysis["skills"]["projects"]
+    projects_actions = analysis["actions"]["projects"]
+
+    skills_score = skills_scoring(skills_keywords, jd_skills)
+    experience_score = experience_scoring(experience_skills, experience_actions, jd_skills)
+    projects_score = project_scoring(projects_skills, projects_actions, jd_skills)
+    final_score = calculate_final_score(skills_score, experience_score, projects_score, jd_skills, skills_keywords, experience_skills, projects_skills)
+
+    # The only place the matched/missing sets are sorted into lists.
+    missing_skills = final_score.skills_missing_everywhere()
+    return {
+        "final_score": final_score.final_score,
+        "match_level": final_score.match_level, 
+        "score_breakdown": {
+            "skills": skills_score.score,
+            "experience": experience_score.score,
+            "projects": projects_score.score
+        },
+        "matched_skills": skills_score.matched_list(),
+        "missing_skills": missing_skills,
+        "suggestions": generate_suggestions(final_score.final_score, missing_skills)
+    }
+
+
+def generate_suggestions(final_score: int, missing_skills: list) -> list:
+    suggestions = []
+
+    if final_score < 50:
+        suggestions.append("Strengthen alignment with the job description by focusing on core required skills.")
+    elif final_score < 70:
+        suggestions.append("Good profile overall. Adding the missing skills can improve your match.")
+    else:
+        suggestions.append("Strong match for the role. Minor improvements can further strengthen your profile.")
+
+    for skill in missing_skills:
+        suggestions.append(f"Consider adding experience or projects demonstrating {skill}.")
+
+    return suggestions
@@ -0,0 +1,327 @@
+import asyncio
+import json
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+from database import SessionLocal
+from models import EvaluationJob
+from services.batch_evaluator import analyze_resumes
+from services.callbacks import notify_callback
+from services.evaluation_pipeline import analyze_job_description_async, score_resume
+from services.evaluation_writer import evaluation_writer
+from services.executors import cpu_pool
+from services.job_profiles import job_analysis_async
+from services.metrics import count_rejection
+from services.revisions import jd_key, revision_delta
+
+# Consumer tasks per process; 0 leaves this process enqueue-only.
+QUEUE_WORKERS = int(os.getenv("QUEUE_WORKERS", "2"))
+# Most jobs one worker claims at once; all of them share a JD.
+QUEUE_BATCH = int(os.getenv("QUEUE_BATCH", "16"))
+# How often an idle worker checks the table for jobs queued by other processes.
+QUEUE_POLL_INTERVAL = float(os.getenv("QUEUE_POLL_INTERVAL", "1"))
+# A running job not finished within this many seconds (its worker died) is queued again,
+# up to QUEUE_MAX_ATTEMPTS runs in total.
+QUEUE_LEASE = float(os.getenv("QUEUE_LEASE", "300"))
+QUEUE_MAX_ATTEMPTS = int(os.getenv("QUEUE_MAX_ATTEMPTS", "3"))
+# Queued jobs (across all processes) beyond which new ones are refused; 0 disables.
+QUEUE_MAX_DEPTH = int(os.getenv("QUEUE_MAX_DEPTH", "1000"))
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def queue_full(db: Session) -> bool:
+    if not QUEUE_MAX_DEPTH:
+        return False
+    queued = db.execute(select(func.count()).select_from(EvaluationJob).where(EvaluationJob.status == "queued")).scalar()
+    return queued >= QUEUE_MAX_DEPTH
+
+
+def enqueue_evaluation(
+    db: Session,
+    filename: str,
+    resume: bytes,
+    jd_data: str = None,
+    job_id: int = None,
+    email: str = None,
+    callback_url: str = None
+) -> int:
+    """
+    Queues one evaluation of a PDF against a JD (its text, or a stored job's id)
+    and returns the evaluation id.
+    """
+    job = EvaluationJob(
+        status="queued",
+        user_email=email,
+        filename=filename,
+        jd_key=jd_key(jd_data, job_id),
+        jd_text=jd_data,
+        job_id=job_id,
+        resume=resume,
+        callback_url=callback_url
+    )
+    db.add(job)
+    db.commit()
+    evaluation_queue.notify()
+    return job.id
+
+
+def evaluation_status(db: Session, evaluation_id: int) -> Optional[dict]:
+    job = db.get(EvaluationJob, evaluation_id)
+    if job is None:
+        return None
+
+    status = {
+        "id": job.id,
+        "status": job.status,
+        "filename": job.filename,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at
+    }
+    if job.status == "done":
+        status["result"] = json.loads(job.result)
+    elif job.status == "failed":
+        status["error"] = job.error
+    return status
+
+
+def _expire_leases(db: Session) -> None:
+    # Jobs whose worker died mid-run go back to the queue, or fail after too many runs.
+    expired = (EvaluationJob.status == "running") & (EvaluationJob.started_at < _now() - timedelta(seconds=QUEUE_LEASE))
+    db.execute(
+        update(EvaluationJob)
+        .where(expired, EvaluationJob.attempts >= QUEUE_MAX_ATTEMPTS)
+        .values(status="failed", error="Evaluation did not finish", resume=None, finished_at=_now())
+    )
+    db.execute(update(EvaluationJob).where(expired).values(status="queued", claimed_by=None))
+
+
+def claim_batch(db: Session, limit: int = QUEUE_BATCH) -> list:
+    """
+    Marks up to `limit` queued jobs as running and returns them as dicts: the
+    oldest queued job plus the next ones sharing its JD. On Postgres the rows are
+    locked with SKIP LOCKED, so workers never wait on each other; SQLite ignores
+    the lock and a claim token decides instead.
+    """
+    _expire_leases(db)
+
+    oldest = db.execute(
+        select(EvaluationJob.id, EvaluationJob.jd_key)
+        .where(EvaluationJob.status == "queued")
+        .order_by(EvaluationJob.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    ).first()
+    if oldest is None:
+        db.commit()
+        return []
+
+    ids = [oldest.id] + list(db.execute(
+        select(EvaluationJob.id)
+        .where(EvaluationJob.status == "queued", EvaluationJob.jd_key == oldest.jd_key, EvaluationJob.id != oldest.id)
+        .order_by(EvaluationJob.id)
+        .limit(limit - 1)
+        .with_for_update(skip_locked=True)
+    ).scalars())
+
+    token = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+    db.execute(
+        update(EvaluationJob)
+        .where(EvaluationJob.id.in_(ids), EvaluationJob.status == "queued")
+        .values(status="running", claimed_by=token, started_at=_now(), attempts=EvaluationJob.attempts + 1)
+    )
+    db.commit()
+
+    rows = db.execute(
+        select(
+            EvaluationJob.id, EvaluationJob.user_email, EvaluationJob.filename, EvaluationJob.jd_key, EvaluationJob.jd_text,
+            EvaluationJob.job_id, EvaluationJob.resume, EvaluationJob.callback_url, EvaluationJob.attempts
+        )
+        .where(EvaluationJob.claimed_by == token, EvaluationJob.status == "running")
+        .order_by(EvaluationJob.id)
+    ).mappings().all()
+    return [dict(row) for row in rows]
+
+
+def finish_jobs(db: Session, outcomes: list) -> None:
+    # [(id, status, result, error)], in one transaction; the stored PDF is dropped.
+    for job_id, status, result, error in outcomes:
+        db.execute(
+            update(EvaluationJob)
+            .where(EvaluationJob.id == job_id)
+            .values(
+                status=status,
+                result=json.dumps(result) if result is not None else None,
+                error=error,
+                resume=None,
+                finished_at=_now()
+            )
+        )
+    db.commit()
+
+
+def release_jobs(db: Session, jobs: list) -> None:
+    # Back to the queue without counting the run: the worker stopped, not the job.
+    db.execute(
+        update(EvaluationJob)
+        .where(EvaluationJob.id.in_([job["id"] for job in jobs]), EvaluationJob.status == "running")
+        .values(status="queued", claimed_by=None, attempts=EvaluationJob.attempts - 1)
+    )
+    db.commit()
+
+
+def retry_or_fail(db: Session, jobs: list, error: str) -> None:
+    retry = [job["id"] for job in jobs if job["attempts"] < QUEUE_MAX_ATTEMPTS]
+    if retry:
+        db.execute(update(EvaluationJob).where(EvaluationJob.id.in_(retry)).values(status="queued", claimed_by=None))
+        db.commit()
+    finish_jobs(db, [(job["id"], "failed", None, error) for job in jobs if job["id"] not in retry])
+
+
+class EvaluationQueue:
+    """
+    Consumes the evaluation_jobs table with QUEUE_WORKERS tasks on the event loop.
+    Each claims a batch of jobs sharing a JD, analyzes the JD once and the PDFs
+    through the process pool in one analyze_resumes pass, and stores the results.
+    Jobs queued in this process wake an idle worker at once; jobs queued elsewhere
+    are picked up within QUEUE_POLL_INTERVAL.
+    """
+
+    def __init__(self, workers: int = QUEUE_WORKERS, batch_size: int = QUEUE_BATCH):
+        self.workers = workers
+        self.batch_size = batch_size
+        self._wakeup = None
+        self._loop = None
+        self._tasks = []
+
+    def start(self) -> None:
+        if self._tasks or self.workers <= 0:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._run()) for _ in range(self.workers)]
+
+    async def stop(self) -> None:
+        # Jobs in flight are released back to the queue (see _run).
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self) -> None:
+        # Callable from any thread, e.g. a sync handler in the threadpool.
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                jobs = await run_in_threadpool(self._claim)
+            except Exception as e:
+                print(f"Failed to claim queued evaluations: {e}")
+                jobs = []
+
+            if not jobs:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), QUEUE_POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            finish = None
+            try:
+                outcomes, rejected, scored = await self._evaluate(jobs)
+                finish = asyncio.ensure_future(run_in_threadpool(self._finish, outcomes))
+                await asyncio.shield(finish)
+            except asyncio.CancelledError:
+                if finish is not None:
+                    # The results are computed; let them land instead of running the jobs again.
+                    stored = await asyncio.gather(finish, return_exceptions=True)
+                    if not isinstance(stored[0], BaseException):
+                        self._tally(rejected, scored)
+                # Whatever is still "running" goes back to the queue now, not after the lease.
+                await run_in_threadpool(self._release, jobs)
+                raise
+            except Exception as e:
+                print(f"Queued evaluation batch failed: {e}")
+                await run_in_threadpool(self._retry_or_fail, jobs, "Evaluation failed")
+                continue
+
+            self._tally(rejected, scored)
+            for job, (_, status, result, error) in zip(jobs, outcomes):
+                if job["callback_url"]:
+                    payload = {"id": job["id"], "status": status, "result": result, "error": error}
+                    self._loop.run_in_executor(None, notify_callback, job["callback_url"], payload)
+
+    def _claim(self) -> list:
+        with SessionLocal() as db:
+            return claim_batch(db, self.batch_size)
+
+    def _finish(self, outcomes: list) -> None:
+        with SessionLocal() as db:
+            finish_jobs(db, outcomes)
+
+    def _tally(self, rejected: list, scored: list) -> None:
+        # Only once the batch's results are stored: a batch that fails to store runs
+        # again, and would otherwise be counted twice.
+        for response in rejected:
+            count_rejection(response)
+        for email, final_score, missing_skills in scored:
+            evaluation_writer.submit(email, final_score, missing_skills)
+
+    def _release(self, jobs: list) -> None:
+        with SessionLocal() as db:
+            release_jobs(db, jobs)
+
+    def _retry_or_fail(self, jobs: list, error: str) -> None:
+        with SessionLocal() as db:
+            retry_or_fail(db, jobs, error)
+
+    async def _evaluate(self, jobs: list) -> tuple:
+        # (outcomes, rejection responses, (email, score, missing skills) of scored jobs);
+        # the last two are tallied by _run once the outcomes are stored.
+        # Every job in a claimed batch has the same JD.
+        first = jobs[0]
+        if first["job_id"] is not None:
+            jd_analysis = await job_analysis_async(first["job_id"])
+            if jd_analysis is None:
+                return [(job["id"], "failed", None, "Job not found") for job in jobs], [], []
+        else:
+            jd_analysis = await analyze_job_description_async(first["jd_text"])
+
+        if jd_analysis["rejection"]:
+            return [(job["id"], "done", jd_analysis["rejection"], None) for job in jobs], [jd_analysis["rejection"]], []
+
+        items = await run_in_threadpool(
+            lambda: list(analyze_resumes([(job["filename"], job["resume"]) for job in jobs], pool=cpu_pool()))
+        )
+
+        outcomes, rejected, scored = [], [], []
+        for job, item in zip(jobs, items):
+            analysis = item["analysis"]
+            if analysis is None:
+                outcomes.append((job["id"], "failed", None, item["error"]))
+            elif analysis["rejection"]:
+                rejected.append(analysis["rejection"])
+                outcomes.append((job["id"], "done", analysis["rejection"], None))
+            else:
+                result = score_resume(analysis, jd_analysis["skills"])
+                if job["user_email"]:
+                    delta = revision_delta(job["user_email"], job["jd_key"], analysis, result)
+                    if delta:
+                        result["delta"] = delta
+                scored.append((job["user_email"], result["final_score"], result["missing_skills"]))
+                outcomes.append((job["id"], "done", result, None))
+
+        return outcomes, rejected, scored
+
+
+evaluation_queue = EvaluationQueue()
@@ -0,0 +1,144 @@
+import json
+from collections import Counter
+from datetime import datetime, timezone
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from typing import TYPE_CHECKING
+from models import User, Evaluation, EvaluationMissingSkill, SkillRollup, DailyRollup
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession # Needs greenlet; only with the async engine
+
+
+def record_evaluations(db: Session, rows: list) -> None:
+    """
+    Persists (email, final_score, missing_skills) rows in one transaction: the
+    Evaluation rows, their normalized missing skills, and the rollup counters the
+    admin dashboard reads.
+    """
+    if not rows:
+        return
+
+    evaluations = [
+        Evaluation(
+            user_email=email,
+            final_score=final_score,
+            missing_skills=json.dumps(missing_skills)
+        )
+        for email, final_score, missing_skills in rows
+    ]
+    db.add_all(evaluations)
+    db.flush() # Assigns the ids the missing-skill rows point at
+
+    db.add_all([
+        EvaluationMissingSkill(evaluation_id=evaluation.id, skill=skill)
+        for evaluation, (_, _, missing_skills) in zip(evaluations, rows)
+        for skill in set(missing_skills)
+    ])
+
+    skill_counts = Counter(skill for _, _, missing_skills in rows for skill in set(missing_skills))
+    today = datetime.now(timezone.utc).date()
+    add_to_rollups(db, skill_counts, {today: (len(rows), sum(score for _, score, _ in rows))})
+
+    db.commit()
+
+
+def add_to_rollups(db: Session, skill_counts: dict, daily_totals: dict) -> None:
+    """
+    Increments the rollup counters with atomic upserts, so concurrent writers
+    never lose an increment. `daily_totals` maps day -> (evaluations, score sum).
+    """
+    skill_rows = [{"skill": skill, "missing_count": count} for skill, count in skill_counts.items()]
+    daily_rows = [
+        {"day": day, "evaluation_count": count, "score_sum": score_sum}
+        for day, (count, score_sum) in daily_totals.items()
+    ]
+
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        _add_to_rollups_portable(db, skill_rows, daily_rows)
+        return
+
+    if skill_rows:
+        statement = insert(SkillRollup).values(skill_rows)
+        db.execute(statement.on_conflict_do_update(
+            index_elements=[SkillRollup.skill],
+            set_={"missing_count": SkillRollup.missing_count + statement.excluded.missing_count}
+        ))
+    if daily_rows:
+        statement = insert(DailyRollup).values(daily_rows)
+        db.execute(statement.on_conflict_do_update(
+            index_elements=[DailyRollup.day],
+            set_={
+                "evaluation_count": DailyRollup.evaluation_count + statement.excluded.evaluation_count,
+                "score_sum": DailyRollup.score_sum + statement.excluded.score_sum
+            }
+        ))
+
+
+def _add_to_rollups_portable(db: Session, skill_rows: list, daily_rows: list) -> None:
+    # Fallback for databases without ON CONFLICT; relies on row locks instead.
+    for row in skill_rows:
+        rollup = db.query(SkillRollup).filter(SkillRollup.skill == row["skill"]).with_for_update().first()
+        if rollup:
+            rollup.missing_count += row["missing_count"]
+        else:
+            db.add(SkillRollup(**row))
+    for row in daily_rows:
+        rollup = db.query(DailyRollup).filter(DailyRollup.day == row["day"]).with_for_update().first()
+        if rollup:
+            rollup.evaluation_count += row["evaluation_count"]
+            rollup.score_sum += row["score_sum"]
+        else:
+            db.add(DailyRollup(**row))
+
+
+def _stats_queries(top_n: int) -> tuple:
+    # Plain select() statements, so the sync and async sessions share them
+    return (
+        select(func.count()).select_from(User),
+        select(func.sum(DailyRollup.evaluation_count), func.sum(DailyRollup.score_sum)),
+        select(SkillRollup.skill)
+        .where(SkillRollup.missing_count > 0)
+        .order_by(SkillRollup.missing_count.desc(), SkillRollup.skill)
+        .limit(top_n),
+    )
+
+
+def _stats_response(user_count: int, totals, top_missing_skills: list) -> dict:
+    evaluation_count, score_sum = totals
+    avg_score = round(score_sum / evaluation_count, 1) if evaluation_count else 0
+
+    return {
+        "total_users": user_count,
+        "avg_score": avg_score,
+        "top_missing_skills": top_missing_skills if top_missing_skills else ["None yet"]
+    }
+
+
+def admin_stats(db: Session, top_n: int = 5) -> dict:
+    """
+    Dashboard numbers from the rollup tables: a handful of rows regardless of
+    how many evaluations exist.
+    """
+    users, totals, top_missing = _stats_queries(top_n)
+
+    return _stats_response(
+        db.execute(users).scalar(),
+        db.execute(totals).one(),
+        list(db.execute(top_missing).scalars())
+    )
+
+
+async def admin_stats_async(db: "AsyncSession", top_n: int = 5) -> dict:
+    users, totals, top_missing = _stats_queries(top_n)
+
+    return _stats_response(
+        (await db.execute(users)).scalar(),
+        (await db.execute(totals)).one(),
+        list((await db.execute(top_missing)).scalars())
+    )
@@ -0,0 +1,82 @@
+import os
+import queue
+import threading
+import time
+from database import SessionLocal
+from services.evaluation_store import record_evaluations
+from services.metrics import stage
+
+WRITE_BATCH_SIZE = int(os.getenv("EVALUATION_WRITE_BATCH", "100"))              # rows per flush
+WRITE_INTERVAL = float(os.getenv("EVALUATION_WRITE_INTERVAL_MS", "200")) / 1000  # max wait before a flush
+WRITE_QUEUE_SIZE = int(os.getenv("EVALUATION_WRITE_QUEUE", "10000"))
+
+
+class EvaluationWriter:
+    """
+    Write-behind queue for evaluation rows. Requests enqueue and return at once; a
+    background thread flushes every WRITE_BATCH_SIZE rows or WRITE_INTERVAL seconds,
+    whichever comes first, as one transaction whose inserts SQLAlchemy sends as
+    multi-row INSERT statements.
+    """
+
+    def __init__(self, batch_size: int = WRITE_BATCH_SIZE, interval: float = WRITE_INTERVAL):
+        self.batch_size = batch_size
+        self.interval = interval
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=WRITE_QUEUE_SIZE)
+        self._stopping = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._stopping.clear()
+            self._thread = threading.Thread(target=self._run, name="evaluation-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        # Flushes whatever is still queued before returning.
+        if self._thread is not None:
+            self._stopping.set()
+            self._thread.join()
+            self._thread = None
+
+    def submit(self, email: str, final_score: int, missing_skills: list) -> None:
+        try:
+            self._queue.put_nowait((email, final_score, missing_skills))
+        except queue.Full:
+            # Stats are best-effort; never make a request wait on the database.
+            self.dropped += 1
+            print("Evaluation write queue full, dropping row")
+
+    def _run(self) -> None:
+        while not (self._stopping.is_set() and self._queue.empty()):
+            try:
+                rows = [self._queue.get(timeout=self.interval)]
+            except queue.Empty:
+                continue
+
+            deadline = time.monotonic() + self.interval
+            while len(rows) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    rows.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            self._flush(rows)
+
+    @stage("persist")
+    def _flush(self, rows: list) -> None:
+        db = SessionLocal()
+        try:
+            record_evaluations(db, rows)
+        except Exception as e:
+            db.rollback()
+            print(f"Failed to save {len(rows)} evaluations: {e}")
+        finally:
+            db.close()
+
+
+evaluation_writer = EvaluationWriter()
@@ -0,0 +1,129 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from fastapi import HTTPException
+from services.taxonomy import get_taxonomy, reload_taxonomy
+from services.nlp_processor import warm_up
+from services.semantic_matcher import warm_up as warm_up_semantic
+from services.metrics import collect, record
+
+CPU_WORKERS = int(os.getenv("CPU_WORKERS", "0")) or os.cpu_count() or 1   # 0 -> one per core
+# Evaluations admitted at once per uvicorn worker; further requests get a 503.
+MAX_PENDING_EVALUATIONS = int(os.getenv("MAX_PENDING_EVALUATIONS", "32"))
+# Batch requests (/evaluate/batch, /evaluate/rank, /candidates) admitted at once per
+# uvicorn worker. Each one can keep the whole process pool busy.
+MAX_PENDING_BATCHES = int(os.getenv("MAX_PENDING_BATCHES", "2"))
+
+PARSE_TIMEOUT = float(os.getenv("PARSE_TIMEOUT", "20"))   # seconds, PDF text extraction
+NLP_TIMEOUT = float(os.getenv("NLP_TIMEOUT", "20"))       # seconds, spaCy + extraction
+
+_cpu_pool = None
+
+
+def _init_cpu_worker() -> None:
+    # Load the spaCy model and the taxonomy before the first task arrives.
+    # Children forked from a preloaded parent (see gunicorn.conf.py) already have both.
+    warm_up_semantic(get_taxonomy())
+    warm_up()
+
+
+def _run_with_taxonomy(version: str, fn, *args):
+    # A reload in the web process doesn't reach pool children by itself; catch up here.
+    if get_taxonomy().version != version:
+        reload_taxonomy()
+    # Stage timings measured in the child come back with the result (see run_cpu).
+    return collect(fn, *args)
+
+
+def cpu_pool() -> ProcessPoolExecutor:
+    global _cpu_pool
+    if _cpu_pool is None:
+        _cpu_pool = ProcessPoolExecutor(max_workers=CPU_WORKERS, initializer=_init_cpu_worker)
+    return _cpu_pool
+
+
+def start_executors() -> None:
+    pool = cpu_pool()
+    # Spawn every child now so spaCy loading doesn't land on the first requests.
+    for future in [pool.submit(get_taxonomy) for _ in range(CPU_WORKERS)]:
+        future.result()
+
+
+def shutdown_executors() -> None:
+    global _cpu_pool
+    if _cpu_pool is not None:
+        _cpu_pool.shutdown(wait=False, cancel_futures=True)
+        _cpu_pool = None
+
+
+async def run_cpu(fn, *args, timeout: float, stage: str):
+    """
+    Runs a CPU-bound function in the process pool without blocking the event loop.
+    Raises a 504 when the stage exceeds its timeout (the child finishes the task in
+    the background) and a 503 if the pool died, which is then rebuilt.
+    """
+    global _cpu_pool
+    loop = asyncio.get_running_loop()
+    pool = cpu_pool()
+    try:
+        future = loop.run_in_executor(pool, _run_with_taxonomy, get_taxonomy().version, fn, *args)
+        result, observations = await asyncio.wait_for(future, timeout)
+        record(observations)
+        return result
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail=f"{stage} timed out")
+    except BrokenProcessPool:
+        print(f"Process pool broke during {stage}; restarting it")
+        # Another request may already have replaced it; only drop the broken one.
+        if _cpu_pool is pool:
+            _cpu_pool = None
+        # Stops its management thread and any children that survived.
+        pool.shutdown(wait=False, cancel_futures=True)
+        raise HTTPException(status_code=503, detail="Server busy, please retry", headers={"Retry-After": "1"})
+
+
+def submit_cpu(pool: ProcessPoolExecutor, fn, *args):
+    """
+    Submits fn(*args) to `pool` the way run_cpu runs it, at this process's taxonomy
+    version, for code that is already off the event loop (the batch endpoints run in
+    the thread pool). The future resolves to (result, observations) for record().
+    """
+    return pool.submit(_run_with_taxonomy, get_taxonomy().version, fn, *args)
+
+
+class AdmissionGate:
+    """
+    Bounds the requests in flight on this worker that feed the process pool.
+    enter() and leave() may run on different threads (a streamed response ends
+    in the threadpool), hence the lock.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.active = 0
+        self._lock = threading.Lock()
+
+    def enter(self) -> None:
+        with self._lock:
+            if self.active >= self.limit:
+                raise HTTPException(status_code=503, detail="Server busy, please retry", headers={"Retry-After": "1"})
+            self.active += 1
+
+    def leave(self) -> None:
+        with self._lock:
+            self.active -= 1
+
+    @contextmanager
+    def admit(self):
+        self.enter()
+        try:
+            yield
+        finally:
+            self.leave()
+
+
+evaluation_gate = AdmissionGate(MAX_PENDING_EVALUATIONS)
+batch_gate = AdmissionGate(MAX_PENDING_BATCHES)
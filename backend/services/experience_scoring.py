@@ -1,29 +1,22 @@
+from services.metrics import stage
+from services.score_results import SectionScore
+
+@stage("score_experience")
 def experience_scoring(
     experience_skills: set,
     experience_actions: set,
     jd_skills: set,
     max_score: int = 25
-) -> dict:
+) -> SectionScore:
     if not experience_skills and not experience_actions:
-        return {
-            "score": 0,
-            "matched_experience": [],
-            "missing_experience": sorted(list(jd_skills)),
-            "match_percentage": 0
-        }
+        return SectionScore("experience", 0, 0, frozenset(), jd_skills)
 
     base_score = 5
     action_bonus = 3 if experience_actions else 0
     if not jd_skills:
-        return {
-            "score": min(base_score + action_bonus, max_score),
-            "matched_experience": [],
-            "missing_experience": [],
-            "match_percentage": 100
-        }
+        return SectionScore("experience", min(base_score + action_bonus, max_score), 100, frozenset(), frozenset())
 
     matched = experience_skills & jd_skills
-    missing = jd_skills - matched
 
     usage_ratio = len(matched) / len(jd_skills)
     if usage_ratio == 0 and experience_actions:
@@ -36,9 +29,10 @@ def experience_scoring(
 
     final_score = base_score + action_bonus + relevance_bonus + usage_score
 
-    return {
-        "score": min(final_score, max_score),
-        "matched_experience": sorted(list(matched)),
-        "missing_experience": sorted(list(missing)),
-        "match_percentage": round(usage_ratio * 100, 2)
-    }
+    return SectionScore(
+        "experience",
+        min(final_score, max_score),
+        round(usage_ratio * 100, 2),
+        matched,
+        jd_skills - matched
+    )
@@ -0,0 +1,105 @@
+import json
+from typing import Optional
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from database import SessionLocal
+from models import JobProfile
+from services.evaluation_pipeline import analyze_job_description_async
+from services.result_cache import jd_cache, content_hash, normalize_text
+from services.taxonomy import get_taxonomy
+
+
+def job_key(job_id: int) -> str:
+    return f"job:{job_id}:{get_taxonomy().version}"
+
+
+def profile_analysis(job: JobProfile) -> dict:
+    # Same shape as analyze_job_description, so /evaluate can't tell the difference.
+    return {
+        "rejection": json.loads(job.rejection) if job.rejection else None,
+        "skills": frozenset(json.loads(job.skills))
+    }
+
+
+def job_response(job: JobProfile) -> dict:
+    analysis = profile_analysis(job)
+    return {
+        "id": job.id,
+        "version": f"{job.jd_hash[:16]}-{job.taxonomy_version}",
+        "skills": sorted(analysis["skills"]),
+        "rejection": analysis["rejection"]
+    }
+
+
+def _apply(job: JobProfile, analysis: dict) -> None:
+    job.taxonomy_version = get_taxonomy().version
+    job.skills = json.dumps(sorted(analysis["skills"]))
+    job.rejection = json.dumps(analysis["rejection"]) if analysis["rejection"] else None
+
+
+def save_job_profile(db: Session, jd_data: str, analysis: dict) -> JobProfile:
+    """
+    Stores the compiled profile of a JD. Posting the same JD again (after
+    normalization) returns its existing profile, refreshed if the taxonomy changed.
+    """
+    jd_hash = content_hash(normalize_text(jd_data))
+
+    job = db.execute(select(JobProfile).where(JobProfile.jd_hash == jd_hash)).scalar()
+    if job is None:
+        job = JobProfile(jd_hash=jd_hash, jd_text=jd_data)
+        _apply(job, analysis)
+        db.add(job)
+        try:
+            db.commit()
+        except IntegrityError:
+            # Posted concurrently by another request; use its row.
+            db.rollback()
+            job = db.execute(select(JobProfile).where(JobProfile.jd_hash == jd_hash)).scalar_one()
+    elif job.taxonomy_version != get_taxonomy().version:
+        _apply(job, analysis)
+        db.commit()
+
+    db.refresh(job)
+    return job
+
+
+def get_job_profile(db: Session, job_id: int) -> Optional[JobProfile]:
+    return db.get(JobProfile, job_id)
+
+
+async def job_analysis_async(job_id: int) -> Optional[dict]:
+    """
+    The stored profile of a job in analyze_job_description's shape, or None if
+    there is no such job. Served from the JD cache after the first load; a profile
+    compiled against an older taxonomy is rebuilt from its text and saved.
+    """
+    key = job_key(job_id)
+    analysis = jd_cache.get(key)
+    if analysis is not None:
+        return analysis
+
+    def load():
+        with SessionLocal() as db:
+            job = get_job_profile(db, job_id)
+            if job is None:
+                return None
+            return {"text": job.jd_text, "current": job.taxonomy_version == get_taxonomy().version, "analysis": profile_analysis(job)}
+
+    job = await run_in_threadpool(load)
+    if job is None:
+        return None
+
+    analysis = job["analysis"]
+    if not job["current"]:
+        analysis = await analyze_job_description_async(job["text"])
+
+        def refresh():
+            with SessionLocal() as db:
+                save_job_profile(db, job["text"], analysis)
+
+        await run_in_threadpool(refresh)
+
+    jd_cache.set(key, analysis)
+    return analysis
@@ -1,47 +1,26 @@
 from services.nlp_processor import preprocess
+from services.taxonomy import get_taxonomy
+from services.semantic_matcher import SEMANTIC_MATCHING, semantic_skills
+from services.metrics import stage
 
-TECH_SKILLS = {
-    "react": ["react", "reactjs", "react.js"],
-    "nodejs": ["node", "nodejs"],
-    "python": ["python"],
-    "java": ["java"],
-    "sql": ["sql"],
-    "docker": ["docker"],
-    "aws": ["aws"],
-    "fastapi": ["fastapi"],
-    "git": ["git"],
-}
-
-ACTION_VERBS = {
-    "develop": ["develop"],
-    "execute": ["execute"],
-    "optimize": ["optimize"],
-    "collaborate": ["collaborate"],
-    "enhance": ["enhance"],
-    "build": ["build"],
-    "implement": ["implement"],
-    "design": ["design"],
-    "integrate": ["integrate"],
-}
 
+@stage("extract")
+def find_skills(tokens: list) -> set:
+    taxonomy = get_taxonomy()
+    found = taxonomy.skill_matcher.find(tokens)
+    if SEMANTIC_MATCHING:
+        found |= semantic_skills(taxonomy, tokens)
+    return found
 
-def extract_skills(text: str) -> set:
-    tokens = preprocess(text)
-    found = set()
-
-    for canonical, aliases in TECH_SKILLS.items():
-        if any(alias in tokens for alias in aliases):
-            found.add(canonical)
 
-    return found
+@stage("extract")
+def find_actions(tokens: list) -> set:
+    return get_taxonomy().action_matcher.find(tokens)
 
 
-def extract_actions(text: str) -> set:
-    tokens = preprocess(text)
-    found = set()
+def extract_skills(text: str) -> set:
+    return find_skills(preprocess(text))
 
-    for canonical, aliases in ACTION_VERBS.items():
-        if any(alias in tokens for alias in aliases):
-            found.add(canonical)
 
-    return found
+def extract_actions(text: str) -> set:
+    return find_actions(preprocess(text))
@@ -0,0 +1,240 @@
+import contextvars
+import functools
+import os
+import random
+import re
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from services.result_cache import cache_stats
+
+# Stage timers and the /metrics histograms. With METRICS_ENABLED=0 the stage
+# decorators return the functions untouched and nothing is recorded.
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+# Adds an X-Timing header (Server-Timing syntax, milliseconds) to every response.
+TIMING_HEADER = os.getenv("TIMING_HEADER", "0") == "1"
+# Fraction of requests to profile (0 disables), with "cprofile" or "pyinstrument".
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILER = os.getenv("PROFILER", "cprofile")
+PROFILE_DIR = os.getenv("PROFILE_DIR", tempfile.gettempdir())
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PAGE_BUCKETS = (1, 2, 3, 5, 10, 20, 30)
+BYTE_BUCKETS = (16_384, 65_536, 262_144, 1_048_576, 4_194_304, 10_485_760)
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, buckets: tuple, label: str = None):
+        self.name = name
+        self.help = help
+        self.buckets = buckets
+        self.label = label
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, label_value: str = "") -> None:
+        with self._lock:
+            series = self._series.get(label_value)
+            if series is None:
+                series = self._series[label_value] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][bisect_left(self.buckets, value)] += 1
+            series[1] += value
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {key: (list(counts), total) for key, (counts, total) in self._series.items()}
+
+        for label_value, (counts, total) in sorted(series.items()):
+            labels = f'{self.label}="{label_value}",' if self.label else ""
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{labels}le="{bound}"}} {cumulative}')
+            labels = "{" + labels.rstrip(",") + "}" if labels else ""
+            lines.append(f"{self.name}_sum{labels} {total}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+
+        return lines
+
+
+class Counter:
+    def __init__(self, name: str, help: str, label: str):
+        self.name = name
+        self.help = help
+        self.label = label
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, label_value: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[label_value] = self._values.get(label_value, 0) + amount
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = sorted(self._values.items())
+        lines.extend(f'{self.name}{{{self.label}="{key}"}} {value}' for key, value in values)
+
+        return lines
+
+
+stage_seconds = Histogram("ats_stage_seconds", "Time spent in each evaluation stage.", LATENCY_BUCKETS, "stage")
+request_seconds = Histogram("ats_request_seconds", "Request latency by route.", LATENCY_BUCKETS, "route")
+pdf_pages = Histogram("ats_pdf_pages", "Pages per parsed PDF.", PAGE_BUCKETS)
+pdf_page_seconds = Histogram("ats_pdf_page_seconds", "Text extraction time per PDF page.", LATENCY_BUCKETS, "path")
+upload_bytes = Histogram("ats_upload_bytes", "Bytes per uploaded resume.", BYTE_BUCKETS)
+rejections = Counter("ats_rejections_total", "Evaluations rejected by a validator.", "match_level")
+
+_METRICS = {metric.name: metric for metric in (stage_seconds, request_seconds, pdf_pages, pdf_page_seconds, upload_bytes, rejections)}
+
+# Observations made inside a process-pool task; returned to the parent with the result.
+_collector = contextvars.ContextVar("metrics_collector", default=None)
+# Stage timings of the current request, for the X-Timing header.
+_request_timings = contextvars.ContextVar("request_timings", default=None)
+
+
+def observe(name: str, value: float, label: str = "") -> None:
+    if not METRICS_ENABLED:
+        return
+
+    collector = _collector.get()
+    if collector is not None:
+        collector.append((name, value, label))
+    else:
+        _record(name, value, label)
+
+
+def _record(name: str, value: float, label: str) -> None:
+    metric = _METRICS[name]
+    if isinstance(metric, Counter):
+        metric.inc(label, value)
+        return
+
+    metric.observe(value, label)
+    if metric is stage_seconds:
+        timings = _request_timings.get()
+        if timings is not None:
+            timings[label] = timings.get(label, 0.0) + value
+
+
+def stage(name: str):
+    """
+    Decorator timing a function as one evaluation stage.
+    """
+    def decorate(fn):
+        if not METRICS_ENABLED:
+            return fn
+
+        @functools.wraps(fn)
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                observe(stage_seconds.name, time.perf_counter() - started, name)
+
+        return timed
+
+    return decorate
+
+
+def collect(fn, *args):
+    """
+    Runs fn in a pool worker and returns (result, observations), so the stage
+    timings measured in the child reach the parent's histograms (see record()).
+    """
+    observations = []
+    token = _collector.set(observations)
+    try:
+        return fn(*args), observations
+    finally:
+        _collector.reset(token)
+
+
+def record(observations: list) -> None:
+    for observation in observations:
+        _record(*observation)
+
+
+def count_rejection(response: dict) -> None:
+    observe(rejections.name, 1, response["match_level"])
+
+
+@contextmanager
+def track_request():
+    """
+    Collects the stage timings of one request. Yields the {stage: seconds} dict,
+    or None when the X-Timing header is off.
+    """
+    if not TIMING_HEADER:
+        yield None
+        return
+
+    timings = {}
+    token = _request_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _request_timings.reset(token)
+
+
+def timing_header(timings: dict, total: float) -> str:
+    entries = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in sorted(timings.items())]
+    entries.append(f"total;dur={total * 1000:.1f}")
+    return ", ".join(entries)
+
+
+@contextmanager
+def maybe_profile(label: str):
+    """
+    Profiles a sampled fraction of requests (PROFILE_SAMPLE_RATE) into PROFILE_DIR.
+    In the event loop the profile also covers whatever else ran concurrently.
+    """
+    if PROFILE_SAMPLE_RATE <= 0 or random.random() >= PROFILE_SAMPLE_RATE:
+        yield
+        return
+
+    path = os.path.join(PROFILE_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}-{re.sub(r'[^a-z0-9]+', '_', label.lower()).strip('_')}")
+    if PROFILER == "pyinstrument":
+        from pyinstrument import Profiler # Optional dependency
+
+        profiler = Profiler(async_mode="enabled")
+        profiler.start()
+        try:
+            yield
+        finally:
+            profiler.stop()
+            with open(path + ".html", "w") as output:
+                output.write(profiler.output_html())
+    else:
+        import cProfile
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            profiler.dump_stats(path + ".prof")
+
+
+def render_metrics() -> str:
+    lines = []
+    for metric in _METRICS.values():
+        lines.extend(metric.render())
+
+    caches = cache_stats()
+    lines.append("# HELP ats_cache_lookups_total Result cache lookups by outcome.")
+    lines.append("# TYPE ats_cache_lookups_total counter")
+    for name, stats in caches.items():
+        for outcome, key in (("memory_hit", "memory_hits"), ("disk_hit", "disk_hits"), ("miss", "misses")):
+            lines.append(f'ats_cache_lookups_total{{cache="{name}",outcome="{outcome}"}} {stats[key]}')
+    lines.append("# HELP ats_cache_hit_ratio Result cache hit rate since startup.")
+    lines.append("# TYPE ats_cache_hit_ratio gauge")
+    for name, stats in caches.items():
+        lines.append(f'ats_cache_hit_ratio{{cache="{name}"}} {stats["hit_rate"]}')
+
+    return "\n".join(lines) + "\n"
@@ -1,17 +1,147 @@
+import os
+import threading
 import spacy
+from spacy.symbols import ORTH
+from services.metrics import stage
 
-nlp = spacy.load("en_core_web_sm")
+# The extractors only read lemmas, which need the tagger/attribute_ruler/lemmatizer
+# chain. Skipping the dependency parser and NER makes every pass noticeably cheaper.
+EXCLUDED_COMPONENTS = [
+    name.strip()
+    for name in os.getenv("SPACY_EXCLUDE", "parser,ner").split(",")
+    if name.strip()
+]
 
+MODEL_NAME = os.getenv("SPACY_MODEL", "en_core_web_sm")
+
+# The model is loaded on first use (or by warm_up() at startup), not at import,
+# so scripts and tests that never tokenize don't pay for it.
+_nlp = None
+_load_lock = threading.Lock()
+
+# Vocabulary terms that are not purely alphabetic ("react.js", "c++", "c#"). They are
+# kept whole by the tokenizer and survive the is_alpha filter below.
+_symbolic_terms = set()
+# Tokenizer special cases registered before the model was loaded.
+_pending_rules = {}
+
+
+def get_nlp():
+    global _nlp
+    if _nlp is None:
+        with _load_lock:
+            if _nlp is None:
+                model = spacy.load(MODEL_NAME, exclude=EXCLUDED_COMPONENTS)
+                if _pending_rules:
+                    _add_rules(model, _pending_rules)
+                    _pending_rules.clear()
+                _nlp = model
+    return _nlp
+
+
+def warm_up() -> None:
+    """
+    Loads the model and runs it once, so the first request doesn't pay for either.
+    """
+    get_nlp()("warm up")
+
+
+def model_signature() -> str:
+    """
+    Name and version of the spaCy model and library, without loading the model.
+    Lemmas, and so anything compiled from them, can change with either.
+    """
+    version = spacy.util.get_package_version(MODEL_NAME)
+    if version is None and os.path.isdir(MODEL_NAME):
+        version = spacy.util.get_model_meta(MODEL_NAME).get("version")
+    return f"{MODEL_NAME}:{version}:spacy-{spacy.__version__}"
+
+
+def splits_on_tokenize(term: str) -> bool:
+    return len(get_nlp().tokenizer(term.lower())) > 1
+
+
+def _add_rules(model, rules: dict) -> None:
+    # Assigning the rules once rebuilds the special-case table once, instead of
+    # once per term as add_special_case would.
+    merged = dict(model.tokenizer.rules or {})
+    merged.update(rules)
+    model.tokenizer.rules = merged
+
+
+def register_terms(terms, special_cases=None) -> None:
+    """
+    Registers symbolic vocabulary terms so preprocess() emits them as single tokens.
+    `special_cases` are the terms the tokenizer would otherwise split ("c#" -> "c", "#");
+    callers that precompute them (the taxonomy index does) skip re-tokenizing every term,
+    and don't force the model to load: the rules are held until get_nlp() loads it.
+    """
+    new_terms = {term.lower() for term in terms} - _symbolic_terms
+    if not new_terms:
+        return
+
+    if special_cases is None:
+        special_cases = [term for term in new_terms if splits_on_tokenize(term)]
+    special_cases = [term.lower() for term in special_cases if term.lower() in new_terms]
+
+    if special_cases:
+        rules = {term: [{ORTH: term}] for term in special_cases}
+        with _load_lock:
+            if _nlp is None:
+                _pending_rules.update(rules)  # applied by get_nlp()
+            else:
+                _add_rules(_nlp, rules)
+
+    _symbolic_terms.update(new_terms)
+
+
+def _lemma(token):
+    # The token as the extractors see it, or None for tokens preprocess() drops.
+    if token.is_stop or token.is_punct:
+        return None
+    if token.is_alpha:
+        return token.lemma_
+    if token.lower_ in _symbolic_terms:
+        return token.lower_
+    return None
+
+
+def _lemmas(doc) -> list:
+    return [lemma for lemma in map(_lemma, doc) if lemma]
+
+
+@stage("nlp")
 def preprocess(text: str) -> list:
     
-    doc = nlp(text.lower())
+    doc = get_nlp()(text.lower())
+
+    return _lemmas(doc)
+
+
+def lemmatize_phrases(phrases: list) -> list:
+    """
+    The preprocess() tokens of each phrase as a tuple, in one nlp.pipe stream.
+    """
+    return [tuple(_lemmas(doc)) for doc in get_nlp().pipe(phrase.lower() for phrase in phrases)]
+
 
-    tokens = [
-        token.lemma_
-        for token in doc
-        if not token.is_stop
-        and not token.is_punct
-        and token.is_alpha
-    ]
+@stage("nlp")
+def analyze_span_batch(documents: list, batch_size: int = 64) -> list:
+    """
+    Returns the lemma stream of each section for (text, spans) pairs, with spans as
+    {name: [(start, end), ...]} character offsets into `text` (see
+    section_splitter.section_spans). Each section is its own Doc, so its lemmas
+    depend only on its text (what the section cache is keyed on), not on the
+    sections around it; all of them go through a single nlp.pipe stream. Texts
+    must already be lowercased, as extract_text returns them.
+    """
+    sections = [(index, name) for index, (_, spans) in enumerate(documents) for name in spans]
+    texts = (
+        "".join(documents[index][0][start:end] for start, end in documents[index][1][name])
+        for index, name in sections
+    )
 
-    return tokens
+    results = [{} for _ in documents]
+    for (index, name), doc in zip(sections, get_nlp().pipe(texts, batch_size=batch_size)):
+        results[index][name] = _lemmas(doc)
+    return results
@@ -1,30 +1,23 @@
+from services.metrics import stage
+from services.score_results import SectionScore
+
+@stage("score_projects")
 def project_scoring(
     project_skills: set,
     project_actions: set,
     jd_skills: set,
     max_score: int = 15
-) -> dict:
+) -> SectionScore:
     if not project_skills and not project_actions:
-        return {
-            "score": 0,
-            "matched_projects": [],
-            "missing_projects": sorted(list(jd_skills)),
-            "match_percentage": 0
-        }
+        return SectionScore("projects", 0, 0, frozenset(), jd_skills)
 
     base_score = 3
     action_bonus = 2 if project_actions else 0
 
     if not jd_skills:
-        return {
-            "score": min(base_score + action_bonus, max_score),
-            "matched_projects": [],
-            "missing_projects": [],
-            "match_percentage": 100
-        }
+        return SectionScore("projects", min(base_score + action_bonus, max_score), 100, frozenset(), frozenset())
 
     matched = project_skills & jd_skills
-    missing = jd_skills - matched
 
     usage_ratio = len(matched) / len(jd_skills)
     usage_score = round(
@@ -33,9 +26,10 @@ def project_scoring(
 
     final_score = base_score + action_bonus + usage_score
 
-    return {
-        "score": min(final_score, max_score),
-        "matched_projects": sorted(list(matched)),
-        "missing_projects": sorted(list(missing)),
-        "match_percentage": round(usage_ratio * 100, 2)
-    }
+    return SectionScore(
+        "projects",
+        min(final_score, max_score),
+        round(usage_ratio * 100, 2),
+        matched,
+        jd_skills - matched
+    )
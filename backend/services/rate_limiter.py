@@ -0,0 +1,134 @@
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from fastapi import HTTPException
+
+# Evaluations (resumes) per minute per client IP; 0 disables. Not per email: the
+# email is whatever the client sends, so a new one would get a fresh bucket.
+RATE_LIMIT_PER_MINUTE = float(os.getenv("RATE_LIMIT_PER_MINUTE", "30"))
+# How many can be made back to back before the per-minute rate applies.
+RATE_LIMIT_BURST = int(os.getenv("RATE_LIMIT_BURST", "10"))
+# "memory" (per process, default) or "redis" (shared by every worker; needs redis-py).
+RATE_LIMIT_STORE = os.getenv("RATE_LIMIT_STORE", "memory")
+RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL", "redis://localhost:6379/0")
+# Buckets kept by the memory store; the least recently used are dropped past this.
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+
+
+class MemoryBucketStore:
+    """
+    Token buckets in a bounded LRU dict. Each worker process limits on its own, so
+    with N workers a user can get up to N times the configured rate.
+    """
+
+    def __init__(self, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, rate: float, burst: int, cost: int = 1) -> float:
+        """
+        Charges `cost` tokens to the bucket refilled at `rate` per second. Returns 0
+        if they were taken, otherwise the seconds until they can be. A cost above
+        `burst` is admitted from a full bucket and leaves it in debt, so a large
+        batch pays for every file before the next request gets through.
+        """
+        now = time.monotonic()
+        needed = min(cost, burst)
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (burst, now))
+            tokens = min(burst, tokens + (now - updated) * rate)
+            if tokens >= needed:
+                tokens -= cost
+                wait = 0.0
+            else:
+                wait = (needed - tokens) / rate
+
+            self._buckets[key] = (tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+
+        return wait
+
+
+# Same refill arithmetic as MemoryBucketStore.take, atomically on the Redis server
+# and on its clock. Returns the wait as a string, since Lua numbers become integers.
+_REDIS_TAKE = """
+local rate, burst, cost = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(state[1]) or burst
+local updated = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + (now - updated) * rate)
+local needed = math.min(cost, burst)
+local wait = 0
+if tokens >= needed then
+    tokens = tokens - cost
+else
+    wait = (needed - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+redis.call('EXPIRE', KEYS[1], math.ceil((burst - math.min(tokens, 0)) / rate) + 1)
+return tostring(wait)
+"""
+
+
+class RedisBucketStore:
+    """
+    Token buckets shared by every worker and host, one Redis hash per key.
+    """
+
+    def __init__(self, url: str = RATE_LIMIT_REDIS_URL):
+        import redis  # Optional dependency, only for RATE_LIMIT_STORE=redis
+
+        self._client = redis.Redis.from_url(url)
+        self._take = self._client.register_script(_REDIS_TAKE)
+
+    def take(self, key: str, rate: float, burst: int, cost: int = 1) -> float:
+        return float(self._take(keys=[f"ratelimit:{key}"], args=[rate, burst, cost]))
+
+
+_STORES = {
+    "memory": MemoryBucketStore,
+    "redis": RedisBucketStore,
+}
+
+
+class RateLimiter:
+    """
+    Rejects requests over the limit with a 429 and Retry-After, instead of letting
+    them queue CPU work. `store` is anything with MemoryBucketStore's take().
+    """
+
+    def __init__(self, store=None, per_minute: float = RATE_LIMIT_PER_MINUTE, burst: int = RATE_LIMIT_BURST):
+        self.rate = per_minute / 60
+        self.burst = burst
+        self.store = store if store is not None or not per_minute else _STORES[RATE_LIMIT_STORE]()
+
+    def check(self, key: str, cost: int = 1) -> None:
+        if not self.rate:
+            return
+
+        try:
+            wait = self.store.take(key, self.rate, self.burst, cost)
+        except Exception as e:
+            # An unreachable shared store must not take the service down with it.
+            print(f"Rate limit check failed, allowing request: {e}")
+            return
+
+        if wait > 0:
+            raise HTTPException(
+                status_code=429,
+                detail="Too many evaluations, please retry later",
+                headers={"Retry-After": str(math.ceil(wait))}
+            )
+
+
+def client_key(client_host: str) -> str:
+    return f"ip:{client_host}"
+
+
+evaluation_limiter = RateLimiter()
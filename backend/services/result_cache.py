@@ -0,0 +1,192 @@
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+CACHE_SIZE = int(os.getenv("RESULT_CACHE_SIZE", "2048"))          # entries per in-process cache
+CACHE_TTL = float(os.getenv("RESULT_CACHE_TTL", "86400"))          # seconds
+# Path of the SQLite file shared by every uvicorn worker; unset keeps caching in-process only.
+CACHE_DB_PATH = os.getenv("RESULT_CACHE_DB")
+CACHE_DB_MAX_ROWS = int(os.getenv("RESULT_CACHE_DB_MAX_ROWS", "100000"))
+
+
+def content_hash(data) -> str:
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+def normalize_text(text: str) -> str:
+    # Lowercased, whitespace runs collapsed to one space. JDs are validated and matched
+    # in this form (see check_job_description), so it is also what they are keyed on.
+    return " ".join(text.lower().split())
+
+
+class LRUCache:
+    """
+    Thread-safe in-process LRU bounded by entry count, with a per-entry TTL.
+    """
+
+    def __init__(self, maxsize: int = CACHE_SIZE, ttl: float = CACHE_TTL):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCache:
+    """
+    On-disk cache tier shared across processes. Values are pickled; rows past
+    their TTL are ignored on read and purged, along with the oldest rows beyond
+    `max_rows`, every few hundred writes.
+    """
+
+    PURGE_EVERY = 500
+
+    def __init__(self, path: str, ttl: float = CACHE_TTL, max_rows: int = CACHE_DB_MAX_ROWS):
+        self.path = path
+        self.ttl = ttl
+        self.max_rows = max_rows
+        self._local = threading.local()
+        self._writes = 0
+        with self._connection() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS cache_expires_at ON cache (expires_at)")
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str):
+        row = self._connection().execute(
+            "SELECT value FROM cache WHERE key = ? AND expires_at >= ?", (key, time.time())
+        ).fetchone()
+        return pickle.loads(row[0]) if row else None
+
+    def set(self, key: str, value) -> None:
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._connection() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, blob, time.time() + self.ttl),
+            )
+            self._writes += 1
+            if self._writes % self.PURGE_EVERY == 0:
+                conn.execute("DELETE FROM cache WHERE expires_at < ?", (time.time(),))
+                conn.execute(
+                    "DELETE FROM cache WHERE key IN ("
+                    "SELECT key FROM cache ORDER BY expires_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_rows,),
+                )
+
+
+class ResultCache:
+    """
+    Two-tier cache: the in-process LRU first, then the optional shared disk tier,
+    whose hits are promoted into the LRU. Counts hits per tier and misses.
+    """
+
+    def __init__(self, name: str, memory: LRUCache, disk: Optional[SQLiteCache] = None):
+        self.name = name
+        self.memory = memory
+        self.disk = disk
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def get(self, key: str):
+        value = self.memory.get(key)
+        if value is not None:
+            self.memory_hits += 1
+            return value
+
+        if self.disk is not None:
+            try:
+                value = self.disk.get(f"{self.name}:{key}")
+            except Exception as e:
+                print(f"Cache read failed ({self.name}): {e}")
+                value = None
+            if value is not None:
+                self.disk_hits += 1
+                self.memory.set(key, value)
+                return value
+
+        self.misses += 1
+        return None
+
+    def set(self, key: str, value) -> None:
+        self.memory.set(key, value)
+        if self.disk is not None:
+            try:
+                self.disk.set(f"{self.name}:{key}", value)
+            except Exception as e:
+                print(f"Cache write failed ({self.name}): {e}")
+
+    def stats(self) -> dict:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "entries": len(self.memory),
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0
+        }
+
+
+_disk = SQLiteCache(CACHE_DB_PATH) if CACHE_DB_PATH else None
+
+# Parsed PDFs (text + sections) and their skill/action sets, keyed by the PDF's SHA-256.
+resume_cache = ResultCache("resume", LRUCache(), _disk)
+# JD validation verdicts and skill sets, keyed by the SHA-256 of the normalized JD text.
+jd_cache = ResultCache("jd", LRUCache(), _disk)
+# Skill/action sets of one resume section, keyed by the SHA-256 of its text, so a
+# revised resume only re-analyzes the sections that changed.
+section_cache = ResultCache("section", LRUCache(), _disk)
+# Each user's last evaluation per JD, for the delta returned on a re-upload.
+revision_cache = ResultCache("revision", LRUCache(), _disk)
+
+
+def cache_stats() -> dict:
+    return {cache.name: cache.stats() for cache in (resume_cache, jd_cache, section_cache, revision_cache)}
@@ -0,0 +1,34 @@
+from typing import Optional
+from services.evaluation_pipeline import SCORED_SECTIONS
+from services.result_cache import revision_cache, content_hash, normalize_text
+
+
+def jd_key(jd_data: str = None, job_id: int = None) -> str:
+    # The same JD posted as text or stored as a job are tracked separately.
+    return f"job:{job_id}" if job_id is not None else content_hash(normalize_text(jd_data))
+
+
+def revision_delta(email: str, jd: str, analysis: dict, result: dict) -> Optional[dict]:
+    """
+    Compares an evaluation with the user's previous one against the same JD (see
+    jd_key) and remembers it for next time. Returns None on the first evaluation.
+    """
+    key = f"revision:{email.strip().lower()}:{jd}"
+    previous = revision_cache.get(key)
+    revision_cache.set(key, {
+        "final_score": result["final_score"],
+        "missing_skills": result["missing_skills"],
+        "sections": analysis.get("sections", {})
+    })
+    if previous is None:
+        return None
+
+    missing, previously_missing = set(result["missing_skills"]), set(previous["missing_skills"])
+    sections = analysis.get("sections", {})
+    return {
+        "previous_score": previous["final_score"],
+        "score_change": result["final_score"] - previous["final_score"],
+        "resolved_skills": sorted(previously_missing - missing),
+        "new_missing_skills": sorted(missing - previously_missing),
+        "changed_sections": [name for name in SCORED_SECTIONS if sections.get(name) != previous["sections"].get(name)]
+    }
@@ -0,0 +1,29 @@
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class SectionScore:
+    """
+    What one section scorer found. matched/missing stay sets until a response is built.
+    """
+    section: str # "skills", "experience" or "projects"
+    score: int
+    match_percentage: float
+    matched: frozenset
+    missing: frozenset
+
+    def matched_list(self) -> list:
+        return sorted(self.matched)
+
+    def missing_list(self) -> list:
+        return sorted(self.missing)
+
+
+@dataclass(slots=True)
+class FinalScore:
+    final_score: int
+    match_level: str
+    missing_everywhere: frozenset
+
+    def skills_missing_everywhere(self) -> list:
+        return sorted(self.missing_everywhere)
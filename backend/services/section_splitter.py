@@ -1,34 +1,89 @@
-def section_splitter(resume_content: str) -> dict:
-    sections = {
-        "skills": "",
-        "education": "",
-        "experience": "",
-        "projects": "",
-    }
+import json
+import os
+import re
+from services.metrics import stage
+
+# Heading vocabulary: section -> heading lines that open it. A heading matches
+# case-insensitively, with any run of spaces between words and optional trailing
+# punctuation ("Professional Experience:", "PROJECTS —").
+# SECTION_HEADINGS_PATH may point at a JSON file of the same shape to replace it.
+SECTION_HEADINGS = {
+    "skills": ["skills", "technical skills", "skill set", "core skills", "key skills"],
+    "education": ["education", "academic background", "academic qualifications"],
+    "experience": ["experience", "work experience", "professional experience", "internships", "employment history", "work history"],
+    "projects": ["projects", "personal projects", "academic projects", "key projects"],
+    "keywords": ["keywords"],
+}
+
+if os.getenv("SECTION_HEADINGS_PATH"):
+    with open(os.getenv("SECTION_HEADINGS_PATH"), encoding="utf-8") as f:
+        SECTION_HEADINGS = json.load(f)
+
+
+def compile_headings(headings: dict) -> tuple:
+    """
+    Compiles the heading vocabulary into one multiline regex. Returns the pattern
+    and the section each of its named groups stands for.
+    """
+    groups = {}
+    alternatives = []
+
+    for index, (section, lines) in enumerate(headings.items()):
+        group = f"s{index}"
+        groups[group] = section
+        # Longest first, so "work experience" wins over "experience" as a prefix
+        variants = sorted(lines, key=len, reverse=True)
+        words = "|".join(r"[ \t]+".join(map(re.escape, line.split())) for line in variants)
+        alternatives.append(f"(?P<{group}>{words})")
+
+    pattern = re.compile(
+        rf"^[ \t]*(?:{'|'.join(alternatives)})[ \t]*[:\-–—|]*[ \t]*\r?$",
+        re.MULTILINE | re.IGNORECASE,
+    )
+    return pattern, groups
+
+
+HEADING_PATTERN, _GROUP_SECTIONS = compile_headings(SECTION_HEADINGS)
+
+
+def found_sections(text: str) -> set:
+    """
+    Names of the sections whose heading appears in `text`.
+    """
+    return {_GROUP_SECTIONS[match.lastgroup] for match in HEADING_PATTERN.finditer(text)}
+
+
+@stage("sections")
+def section_spans(resume_content: str) -> dict:
+    """
+    Splits the resume in one regex pass, returning each section as a list of
+    (start, end) character offsets into `resume_content` rather than copied text.
+    A section spans from the line after its heading to the next heading line;
+    a heading that appears twice contributes two spans. Text before the first
+    heading belongs to no section.
+    """
+    spans = {section: [] for section in SECTION_HEADINGS}
 
     current_section = None
-    lines = resume_content.split("\n")
-
-    for line in lines:
-        clean_line = line.strip().lower()
-
-        if clean_line in ["skills", "technical skills", "skill set"]:
-            current_section = "skills"
-            continue
-        elif clean_line in ["education", "academic background"]:
-            current_section = "education"
-            continue
-        elif clean_line in ["experience", "work experience", "internships"]:
-            current_section = "experience"
-            continue
-        elif clean_line in ["projects", "personal projects"]:
-            current_section = "projects"
-            continue
-        elif clean_line in ["keywords"]:
-            current_section = "keywords"
-            continue
-
-        if current_section:
-            sections[current_section] += line + "\n"
-
-    return sections
+    content_start = 0
+
+    for match in HEADING_PATTERN.finditer(resume_content):
+        if current_section and match.start() > content_start:
+            spans[current_section].append((content_start, match.start()))
+        current_section = _GROUP_SECTIONS[match.lastgroup]
+        content_start = match.end() + 1 # Skip the heading's newline
+
+    if current_section and len(resume_content) > content_start:
+        spans[current_section].append((content_start, len(resume_content)))
+
+    return spans
+
+
+def section_text(resume_content: str, spans: list) -> str:
+    return "".join(resume_content[start:end] for start, end in spans)
+
+
+def section_splitter(resume_content: str) -> dict:
+    spans = section_spans(resume_content)
+
+    return {section: section_text(resume_content, ranges) for section, ranges in spans.items()}
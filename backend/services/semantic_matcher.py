@@ -0,0 +1,138 @@
+import os
+import threading
+from functools import lru_cache
+import numpy as np
+import spacy
+from services.skill_matcher import alias_words
+
+# Optional fallback for synonyms the alias lists don't cover ("postgresql" -> sql).
+# Needs a spaCy pipeline with static word vectors: a packaged one (en_core_web_md/lg)
+# or a local vectors-only one, e.g. `spacy init vectors en cc.en.300.vec.gz ./vectors`
+# then SEMANTIC_MODEL=./vectors. Runs offline on CPU.
+SEMANTIC_MATCHING = os.getenv("SEMANTIC_MATCHING", "0") == "1"
+SEMANTIC_MODEL = os.getenv("SEMANTIC_MODEL", "en_core_web_md")
+# Cosine similarity a phrase needs to an alias to count as its canonical skill.
+SEMANTIC_THRESHOLD = float(os.getenv("SEMANTIC_THRESHOLD", "0.75"))
+# Token n-grams up to this length are compared, so "machine learning" is one phrase.
+SEMANTIC_MAX_NGRAM = int(os.getenv("SEMANTIC_MAX_NGRAM", "2"))
+# Taxonomies with at least this many alias vectors use an hnswlib index (optional dependency).
+SEMANTIC_ANN_MIN_ROWS = int(os.getenv("SEMANTIC_ANN_MIN_ROWS", "20000"))
+SEMANTIC_CACHE_SIZE = int(os.getenv("SEMANTIC_CACHE_SIZE", "100000"))
+
+# Folded into the taxonomy version, so switching the matcher on or retuning it
+# invalidates every cached analysis and stored job profile.
+SEMANTIC_SIGNATURE = f"semantic:{SEMANTIC_MODEL}:{SEMANTIC_THRESHOLD}:{SEMANTIC_MAX_NGRAM}" if SEMANTIC_MATCHING else ""
+
+
+def phrase_vector(vocab, words: tuple):
+    """
+    Unit-length mean of the words' vectors, or None if any word has no vector.
+    """
+    if not words or not all(vocab.has_vector(word) for word in words):
+        return None
+
+    vector = np.mean([vocab.get_vector(word) for word in words], axis=0)
+    norm = np.linalg.norm(vector)
+    return (vector / norm).astype(np.float32) if norm else None
+
+
+class SemanticIndex:
+    """
+    The alias phrases of a vocabulary as unit vectors, one row per alias, searched
+    by cosine similarity: one matrix product per lookup, or an hnswlib graph for
+    very large taxonomies. Phrase vectors are cached, and every phrase of a token
+    stream is looked up in one batch.
+    """
+
+    __slots__ = ("labels", "matrix", "ann", "threshold", "max_ngram", "_vector")
+
+    def __init__(
+        self,
+        vocabulary: dict,
+        vocab,
+        threshold: float = SEMANTIC_THRESHOLD,
+        max_ngram: int = SEMANTIC_MAX_NGRAM,
+        ann_min_rows: int = SEMANTIC_ANN_MIN_ROWS
+    ):
+        self.threshold = threshold
+        self.max_ngram = max_ngram
+        self._vector = lru_cache(maxsize=SEMANTIC_CACHE_SIZE)(lambda words: phrase_vector(vocab, words))
+
+        self.labels = []
+        rows = []
+        for canonical, aliases in vocabulary.items():
+            for alias in aliases:
+                vector = self._vector(alias_words(alias))
+                if vector is not None:
+                    self.labels.append(canonical)
+                    rows.append(vector)
+        self.matrix = np.stack(rows) if rows else np.zeros((0, vocab.vectors_length), dtype=np.float32)
+
+        self.ann = None
+        if len(rows) >= ann_min_rows:
+            import hnswlib  # Optional dependency, only for very large taxonomies
+
+            self.ann = hnswlib.Index(space="ip", dim=self.matrix.shape[1])
+            self.ann.init_index(max_elements=len(rows), ef_construction=200, M=16)
+            self.ann.add_items(self.matrix, np.arange(len(rows)))
+            self.ann.set_ef(64)
+
+    def find(self, tokens: list) -> set:
+        if not len(self.matrix):
+            return set()
+
+        phrases = {
+            tuple(tokens[start:start + size])
+            for size in range(1, self.max_ngram + 1)
+            for start in range(len(tokens) - size + 1)
+        }
+        vectors = [vector for vector in map(self._vector, phrases) if vector is not None]
+        if not vectors:
+            return set()
+
+        query = np.stack(vectors)
+        if self.ann is not None:
+            rows, distances = self.ann.knn_query(query, k=1)
+            rows, similarity = rows[:, 0], 1 - distances[:, 0]
+        else:
+            scores = query @ self.matrix.T
+            rows = scores.argmax(axis=1)
+            similarity = scores[np.arange(len(rows)), rows]
+
+        return {self.labels[row] for row in rows[similarity >= self.threshold]}
+
+
+_model = None
+_index = {"version": None, "index": None}
+_lock = threading.Lock()
+
+
+def _vectors():
+    global _model
+    if _model is None:
+        from services.nlp_processor import MODEL_NAME, get_nlp
+
+        # The vectors live in the vocab; no pipeline component is needed.
+        _model = get_nlp() if SEMANTIC_MODEL == MODEL_NAME else spacy.load(SEMANTIC_MODEL, exclude=["tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer", "ner", "senter"])
+        if not _model.vocab.vectors_length:
+            raise RuntimeError(f"SEMANTIC_MODEL {SEMANTIC_MODEL} has no word vectors")
+    return _model.vocab
+
+
+def semantic_index(taxonomy) -> SemanticIndex:
+    # Built on first use per taxonomy version (or by warm_up), in every process.
+    if _index["version"] != taxonomy.version:
+        with _lock:
+            if _index["version"] != taxonomy.version:
+                _index["index"] = SemanticIndex(taxonomy.skills, _vectors())
+                _index["version"] = taxonomy.version
+    return _index["index"]
+
+
+def semantic_skills(taxonomy, tokens: list) -> set:
+    return semantic_index(taxonomy).find(tokens)
+
+
+def warm_up(taxonomy) -> None:
+    if SEMANTIC_MATCHING:
+        semantic_index(taxonomy)
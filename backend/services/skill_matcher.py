@@ -0,0 +1,90 @@
+from spacy.lang.en.stop_words import STOP_WORDS
+
+
+def alias_words(alias: str) -> tuple:
+    """
+    Normalizes an alias into the words it appears as in a preprocess() token stream:
+    lowercased, whitespace-split, with stop words dropped ("ruby on rails" -> ruby, rails).
+    """
+    return tuple(word for word in alias.lower().split() if word not in STOP_WORDS)
+
+
+def symbolic_terms(vocabulary: dict) -> set:
+    """
+    Alias words that are not purely alphabetic ("react.js", "c++", "c#"). The
+    tokenizer/filter in nlp_processor has to be told to keep these.
+    """
+    return {
+        word
+        for aliases in vocabulary.values()
+        for alias in aliases
+        for word in alias_words(alias)
+        if not word.isalpha()
+    }
+
+
+class SkillMatcher:
+    """
+    Precompiled alias -> canonical matcher over a lemma stream.
+
+    Every alias is indexed by its first word, so a single pass over the tokens finds
+    all canonical terms with one dict lookup per token; multi-word aliases
+    ("machine learning", "spring boot") are confirmed against the tokens that follow.
+
+    The token stream carries lemmas, so `lemmatize` (see nlp_processor.lemmatize_phrases)
+    maps multi-word aliases through the same pipeline and each is indexed as written
+    and as lemmatized ("data structures" also as datum, structure). Single words are
+    only indexed as written: out of context spaCy lemmatizes acronyms as plurals
+    ("aws" -> aw), which would match unrelated text.
+    """
+
+    __slots__ = ("_index", "symbolic_terms")
+
+    def __init__(self, vocabulary: dict, lemmatize=None):
+        self._index = {}
+        self.symbolic_terms = symbolic_terms(vocabulary)
+
+        entries = [
+            (canonical, alias, alias_words(alias))
+            for canonical, aliases in vocabulary.items()
+            for alias in aliases
+        ]
+        phrases = [(canonical, alias) for canonical, alias, words in entries if len(words) > 1]
+        lemmatized = zip(phrases, lemmatize([alias for _, alias in phrases])) if lemmatize and phrases else ()
+
+        forms = [(canonical, words) for canonical, _, words in entries]
+        forms += [(canonical, words) for (canonical, _), words in lemmatized]
+        for canonical, words in dict.fromkeys(forms):
+            if words:
+                self._index.setdefault(words[0], []).append((words[1:], canonical))
+
+    def as_index(self) -> dict:
+        # Plain lists and strings, for the taxonomy's JSON index.
+        return {
+            "index": {word: [[list(rest), canonical] for rest, canonical in entries] for word, entries in self._index.items()},
+            "symbolic_terms": sorted(self.symbolic_terms),
+        }
+
+    @classmethod
+    def from_index(cls, data: dict) -> "SkillMatcher":
+        matcher = cls.__new__(cls)
+        matcher._index = {word: [(tuple(rest), canonical) for rest, canonical in entries] for word, entries in data["index"].items()}
+        matcher.symbolic_terms = set(data["symbolic_terms"])
+        return matcher
+
+    def find(self, tokens: list) -> set:
+        found = set()
+        index = self._index
+
+        for position, token in enumerate(tokens):
+            candidates = index.get(token)
+            if not candidates:
+                continue
+
+            for rest, canonical in candidates:
+                if not rest:
+                    found.add(canonical)
+                elif tuple(tokens[position + 1:position + 1 + len(rest)]) == rest:
+                    found.add(canonical)
+
+        return found
@@ -1,30 +1,17 @@
-def skills_scoring(resume_skills: set, jd_skills: set, max_score: int = 60) -> dict:
-   
+from services.metrics import stage
+from services.score_results import SectionScore
+
+@stage("score_skills")
+def skills_scoring(resume_skills: set, jd_skills: set, max_score: int = 60) -> SectionScore:
     if not jd_skills:
-        return {
-            "score": max_score,
-            "matched_skills": [],
-            "missing_skills": [],
-            "match_percentage": 100
-        }
+        return SectionScore("skills", max_score, 100, frozenset(), frozenset())
 
     if not resume_skills:
-        return {
-            "score": 0,
-            "matched_skills": [],
-            "missing_skills": sorted(list(jd_skills)),
-            "match_percentage": 0
-        }
+        return SectionScore("skills", 0, 0, frozenset(), jd_skills)
 
     matched = resume_skills & jd_skills
-    missing = jd_skills - resume_skills
 
     match_ratio = len(matched) / len(jd_skills)
     score = round(match_ratio * max_score)
 
-    return {
-        "score": score,
-        "matched_skills": sorted(list(matched)),
-        "missing_skills": sorted(list(missing)),
-        "match_percentage": round(match_ratio * 100, 2)
-    }
+    return SectionScore("skills", score, round(match_ratio * 100, 2), matched, jd_skills - resume_skills)
@@ -0,0 +1,190 @@
+import csv
+import hashlib
+import json
+import os
+import threading
+import time
+from services.nlp_processor import register_terms, splits_on_tokenize, lemmatize_phrases, model_signature
+from services.skill_matcher import SkillMatcher, symbolic_terms
+from services.semantic_matcher import SEMANTIC_SIGNATURE
+
+TAXONOMY_PATH = os.getenv(
+    "TAXONOMY_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "taxonomy.json"),
+)
+# Seconds between checks of the taxonomy file for changes; 0 disables polling.
+# Every worker polls on its own, so an edited file reaches all of them.
+WATCH_INTERVAL = float(os.getenv("TAXONOMY_WATCH_INTERVAL", "0"))
+
+# Bump when the index layout of Taxonomy/SkillMatcher or the way aliases are
+# compiled changes. Part of the version, so cached analyses are invalidated too.
+INDEX_FORMAT = 4
+
+
+class Taxonomy:
+    """
+    A compiled skill/action vocabulary. Immutable once built: a reload builds a new
+    instance and swaps the module reference, so requests keep the one they started with.
+    """
+
+    __slots__ = (
+        "version", "skills", "actions", "skill_matcher", "action_matcher",
+        "skill_aliases", "symbolic_terms", "special_cases",
+    )
+
+    def __init__(self, skills: dict, actions: dict, version: str):
+        self.version = version
+        self.skills = skills
+        self.actions = actions
+        # Flattened, lowercased aliases for the raw-text technical signal check.
+        self.skill_aliases = tuple(sorted({alias.lower() for aliases in skills.values() for alias in aliases}))
+        # Tokenizing every symbolic term is the slow part of activating a large
+        # taxonomy, so the ones needing a tokenizer special case are found at build time.
+        self.symbolic_terms = symbolic_terms(skills) | symbolic_terms(actions)
+        self.special_cases = tuple(sorted(term for term in self.symbolic_terms if splits_on_tokenize(term)))
+        # Registered before the aliases are lemmatized, so preprocess() keeps "c#" whole.
+        register_terms(self.symbolic_terms, self.special_cases)
+        self.skill_matcher = SkillMatcher(skills, lemmatize_phrases)
+        self.action_matcher = SkillMatcher(actions, lemmatize_phrases)
+
+    def as_index(self) -> dict:
+        return {
+            "format": INDEX_FORMAT,
+            "version": self.version,
+            "skills": self.skills,
+            "actions": self.actions,
+            "skill_matcher": self.skill_matcher.as_index(),
+            "action_matcher": self.action_matcher.as_index(),
+            "skill_aliases": list(self.skill_aliases),
+            "special_cases": list(self.special_cases),
+        }
+
+    @classmethod
+    def from_index(cls, data: dict) -> "Taxonomy":
+        taxonomy = cls.__new__(cls)
+        taxonomy.version = data["version"]
+        taxonomy.skills = data["skills"]
+        taxonomy.actions = data["actions"]
+        taxonomy.skill_matcher = SkillMatcher.from_index(data["skill_matcher"])
+        taxonomy.action_matcher = SkillMatcher.from_index(data["action_matcher"])
+        taxonomy.skill_aliases = tuple(data["skill_aliases"])
+        taxonomy.symbolic_terms = taxonomy.skill_matcher.symbolic_terms | taxonomy.action_matcher.symbolic_terms
+        taxonomy.special_cases = tuple(data["special_cases"])
+        return taxonomy
+
+
+def load_vocabulary(path: str) -> tuple:
+    """
+    Reads (skills, actions) from a JSON, YAML or CSV taxonomy file.
+
+    JSON/YAML: {"skills": {canonical: [aliases]}, "actions": {canonical: [aliases]}}
+    CSV: rows of kind,canonical,alias where kind is "skill" or "action".
+    """
+    extension = os.path.splitext(path)[1].lower()
+
+    if extension == ".csv":
+        vocabulary = {"skills": {}, "actions": {}}
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                kind = "actions" if row["kind"].strip().lower() == "action" else "skills"
+                canonical = row["canonical"].strip()
+                alias = (row.get("alias") or canonical).strip()
+                vocabulary[kind].setdefault(canonical, []).append(alias)
+    elif extension in (".yaml", ".yml"):
+        import yaml  # Optional dependency, only needed for YAML taxonomies
+        with open(path, encoding="utf-8") as f:
+            vocabulary = yaml.safe_load(f)
+    else:
+        with open(path, encoding="utf-8") as f:
+            vocabulary = json.load(f)
+
+    return vocabulary.get("skills", {}), vocabulary.get("actions", {})
+
+
+def index_path(path: str) -> str:
+    return path + ".idx"
+
+
+def compile_taxonomy(path: str = TAXONOMY_PATH) -> Taxonomy:
+    """
+    Returns the compiled taxonomy for `path`, loading the prebuilt index next to it
+    when it matches the file's content hash, the spaCy model and the matcher
+    settings, and (re)building it otherwise. The index is plain JSON, so a
+    tampered file can at worst change the vocabulary, not run code.
+    """
+    with open(path, "rb") as f:
+        signature = f"{SEMANTIC_SIGNATURE}:{INDEX_FORMAT}:{model_signature()}"
+        version = hashlib.sha256(f.read() + signature.encode()).hexdigest()[:16]
+
+    try:
+        with open(index_path(path), encoding="utf-8") as f:
+            index = json.load(f)
+        if index["format"] == INDEX_FORMAT and index["version"] == version:
+            return Taxonomy.from_index(index)
+    except Exception:
+        pass # Missing, stale or unreadable index: rebuild it
+
+    skills, actions = load_vocabulary(path)
+    taxonomy = Taxonomy(skills, actions, version)
+
+    # Write-then-rename so concurrently starting workers never read a partial index.
+    tmp_path = f"{index_path(path)}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(taxonomy.as_index(), f)
+        os.replace(tmp_path, index_path(path))
+    except Exception as e:
+        # The index is only a startup cache; serve the taxonomy just built without it.
+        print(f"Could not write taxonomy index: {e}")
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+
+    return taxonomy
+
+
+_current = None
+_current_mtime = None
+_next_check = 0.0
+_lock = threading.Lock()
+
+
+def reload_taxonomy(path: str = TAXONOMY_PATH) -> Taxonomy:
+    """
+    Builds the taxonomy and atomically swaps it in. In-flight requests finish on
+    the previous instance; nothing is dropped.
+    """
+    global _current, _current_mtime
+
+    with _lock:
+        mtime = os.path.getmtime(path)
+        taxonomy = compile_taxonomy(path)
+        register_terms(taxonomy.symbolic_terms, taxonomy.special_cases)
+        _current, _current_mtime = taxonomy, mtime
+
+    return taxonomy
+
+
+def get_taxonomy() -> Taxonomy:
+    global _next_check
+
+    taxonomy = _current
+    if taxonomy is None:
+        return reload_taxonomy()
+
+    if WATCH_INTERVAL and time.monotonic() >= _next_check:
+        _next_check = time.monotonic() + WATCH_INTERVAL
+        try:
+            if os.path.getmtime(TAXONOMY_PATH) != _current_mtime:
+                return reload_taxonomy()
+        except Exception as e:
+            print(f"Taxonomy reload failed, keeping version {taxonomy.version}: {e}")
+
+    return taxonomy
+
+
+if __name__ == "__main__":
+    # Prebuild the index at deploy time so no worker compiles it on startup.
+    taxonomy = compile_taxonomy()
+    print(f"Taxonomy {taxonomy.version}: {len(taxonomy.skills)} skills, {len(taxonomy.actions)} actions -> {index_path(TAXONOMY_PATH)}")
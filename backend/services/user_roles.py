@@ -0,0 +1,74 @@
+import os
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from models import User
+from services.result_cache import LRUCache
+
+# Logins are served from this cache; a role change made through set_user_role is
+# visible at once on this worker and within ROLE_CACHE_TTL seconds on the others.
+ROLE_CACHE_TTL = float(os.getenv("ROLE_CACHE_TTL", "300"))
+ROLE_CACHE_SIZE = int(os.getenv("ROLE_CACHE_SIZE", "10000"))
+ROLES = ("user", "admin")
+
+role_cache = LRUCache(maxsize=ROLE_CACHE_SIZE, ttl=ROLE_CACHE_TTL)
+
+
+def get_or_create_role(db: Session, email: str, name: str) -> str:
+    """
+    Returns the user's role, creating the user on first login. Warm logins never
+    touch the database; cold ones cost one SELECT, or one upsert for new users.
+    """
+    role = role_cache.get(email)
+    if role is not None:
+        return role
+
+    role = db.execute(select(User.role).where(User.email == email)).scalar()
+    if role is None:
+        role = _create_user(db, email, name)
+
+    role_cache.set(email, role)
+    return role
+
+
+def _create_user(db: Session, email: str, name: str) -> str:
+    # INSERT ... ON CONFLICT DO NOTHING RETURNING role: two concurrent first logins
+    # can't both insert, and the loser reads the winner's row instead of failing.
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+        statement = (
+            insert(User)
+            .values(email=email, name=name, role="user")
+            .on_conflict_do_nothing(index_elements=[User.email])
+            .returning(User.role)
+        )
+        role = db.execute(statement).scalar()
+        db.commit()
+    else:
+        try:
+            db.add(User(email=email, name=name, role="user"))
+            db.commit()
+            role = "user"
+        except IntegrityError:
+            db.rollback()
+            role = None
+
+    if role is None:
+        role = db.execute(select(User.role).where(User.email == email)).scalar()
+
+    return role or "user"
+
+
+def set_user_role(db: Session, email: str, role: str) -> bool:
+    """
+    Changes a user's role and drops the cached one. Returns False if there is no such user.
+    """
+    result = db.execute(update(User).where(User.email == email).values(role=role))
+    db.commit()
+    role_cache.delete(email)
+
+    return result.rowcount > 0
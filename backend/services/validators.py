@@ -1,118 +1,206 @@
-from fastapi import HTTPException
 import re
-from typing import Optional
-from services.keywords_finder import TECH_SKILLS
+from typing import Iterable, List, Optional, Tuple
+from services.taxonomy import get_taxonomy
 
-def validate_document_type(text: str) -> Optional[str]:
+# Signals of non-resume documents
+OFFER_LETTER_KEYWORDS = [
+    "we are pleased to offer",
+    "date of joining",
+    "salary breakdown",
+    "acceptance of offer",
+    "employment contract",
+    "probation period"
+]
+
+# Illegal Intent - Immediate Rejection
+ILLEGAL_PHRASES = [
+    "steal money",
+    "hack bank",
+    "credit card theft",
+    "evade taxes",
+    "money laundering",
+    "sell drugs",
+    "harmful software",
+    "malware distribution"
+]
+
+# "risky" words that are allowed ONLY if they modify a relevant noun
+RISKY_WORDS = ["killer", "ninja", "rockstar", "pirate"]
+
+# Allowed contexts: word followed by specific professional nouns
+ALLOWED_CONTEXTS = r"(developer|coder|programmer|engineer|manager|architect|designer|skill|feature|app|code|software)"
+ALLOWED_CONTEXT_PATTERN = re.compile(rf"\s+{ALLOWED_CONTEXTS}")
+# How far after a risky word its noun may appear
+CONTEXT_WINDOW = 30
+
+# General Technical Terms: broad terms that indicate a technical role even if
+# the specific stack isn't in our taxonomy
+GENERAL_TERMS = [
+    "software", "developer", "engineer", "devops", "architect",
+    "frontend", "backend", "fullstack", "mobile", "web",
+    "app", "application", "system", "database", "cloud",
+    "api", "server", "code", "programming", "coding",
+    "technical", "technology", "data", "algorithm",
+    "security", "network", "framework", "library", "tool"
+]
+
+OFFER_LETTER_ERROR = "Invalid Document Type. Looks like an offer letter or contract."
+TOO_SHORT_ERROR = "Invalid Document. Content too short to be a resume."
+ILLEGAL_ERROR = "Safety Violation: Illegal or harmful content detected."
+NO_SIGNAL_ERROR = "Invalid Job Description. No technical keywords or relevant terms found."
+
+
+def phrase_pattern(phrases: Iterable[str]) -> str:
     """
-    Validates if the document appears to be a resume.
-    Rejects content that looks like offer letters, huge certificates, or non-resume text.
+    Builds a regex matching any of the phrases as a substring, factored into a
+    trie so each position is tried against shared prefixes once.
+    """
+    trie = {}
+    for phrase in phrases:
+        if not phrase:
+            continue
+        node = trie
+        for char in phrase:
+            if "" in node:
+                break  # a shorter phrase already matches here
+            node = node.setdefault(char, {})
+        else:
+            node.clear()
+            node[""] = True
+
+    return _trie_pattern(trie) if trie else r"(?!)"
+
+
+def _trie_pattern(node: dict) -> str:
+    if "" in node:
+        return ""
+
+    branches = [re.escape(char) + _trie_pattern(child) for char, child in sorted(node.items())]
+    if len(branches) == 1:
+        return branches[0]
+    return "(?:" + "|".join(branches) + ")"
+
+
+def compile_scanner(tech_aliases: Iterable[str]) -> dict:
+    """
+    Compiles every phrase list into one scanner:
+    - "gate" is a plain alternation of all phrases, so the regex engine can skip
+      ahead by first character to the next position where any phrase starts;
+    - "gate_no_tech" drops the technical terms once one has been seen;
+    - "at" records, with one optional lookahead per category, every kind of
+      phrase starting at a position, so overlapping phrases are all seen.
+    """
+    categories = {
+        "offer": phrase_pattern(OFFER_LETTER_KEYWORDS),
+        "illegal": phrase_pattern(ILLEGAL_PHRASES),
+        "risky": "(?:" + "|".join(map(re.escape, RISKY_WORDS)) + ")",
+        "tech": phrase_pattern(list(tech_aliases) + GENERAL_TERMS),
+    }
+    at = {name: f"(?=(?P<{name}>{pattern}))?" for name, pattern in categories.items()}
+    at["risky"] = rf"(?=\b(?P<risky>{categories['risky']})\b)?"
+
+    return {
+        "gate": re.compile("|".join(categories.values())),
+        "gate_no_tech": re.compile("|".join(pattern for name, pattern in categories.items() if name != "tech")),
+        "at": re.compile("".join(at.values())),
+    }
+
+
+_scanner = {"version": None, "patterns": None}
+
+
+def _patterns() -> dict:
+    # The skill aliases come from the taxonomy, so recompile when it's reloaded.
+    taxonomy = get_taxonomy()
+    if _scanner["version"] != taxonomy.version:
+        _scanner["patterns"] = compile_scanner(taxonomy.skill_aliases)
+        _scanner["version"] = taxonomy.version
+
+    return _scanner["patterns"]
+
+
+def scan(text: str) -> dict:
+    """
+    Lowercases the text once and returns every phrase-list finding from one pass:
+    {"offer": bool, "illegal": bool, "risky": word or None, "tech": bool}.
     """
     text_lower = text.lower()
-    
-    # Signals of non-resume documents
-    offer_letter_keywords = [
-        "we are pleased to offer",
-        "date of joining", 
-        "salary breakdown",
-        "acceptance of offer",
-        "employment contract",
-        "probation period"
-    ]
-    
-    for phrase in offer_letter_keywords:
-        if phrase in text_lower:
-            return "Invalid Document Type. Looks like an offer letter or contract."
+    patterns = _patterns()
+    found = {"offer": False, "illegal": False, "tech": False}
+    flagged = set()
+
+    gate = patterns["gate"]
+    position = 0
+    while True:
+        hit = gate.search(text_lower, position)
+        if hit is None:
+            break
+        position = hit.start()
+        match = patterns["at"].match(text_lower, position)
+
+        for name in found:
+            if match.group(name) is not None:
+                found[name] = True
+        if found["tech"]:
+            gate = patterns["gate_no_tech"]
+
+        word = match.group("risky")
+        if word is not None and word not in flagged:
+            # Valid only if an allowed noun follows within the window (e.g. "killer feature")
+            end = position + len(word)
+            if not ALLOWED_CONTEXT_PATTERN.match(text_lower, end, min(len(text_lower), end + CONTEXT_WINDOW)):
+                flagged.add(word)
+
+        position += 1
+
+    # Report the first risky word in list order, as the word-by-word check did.
+    found["risky"] = next((word for word in RISKY_WORDS if word in flagged), None)
+    return found
+
+
+def document_type_error(text: str, findings: dict) -> Optional[str]:
+    if findings["offer"]:
+        return OFFER_LETTER_ERROR
 
     # Assuming a resume must contain some basics (very loose check to be safe)
     # If it's completely empty or extremely short, might be invalid
     if len(text.strip()) < 50:
-         return "Invalid Document. Content too short to be a resume."
+        return TOO_SHORT_ERROR
 
     return None
 
 
+def safety_error(findings: dict) -> Optional[str]:
+    if findings["illegal"]:
+        return ILLEGAL_ERROR
+
+    # The rule: "Reject when such terms appear as nouns or identity-defining phrases".
+    # "ninja developer" -> OK, "developer who is a killer" -> Reject.
+    # Prefer rejection over misinterpretation.
+    if findings["risky"]:
+        return f"Safety Violation: Ambiguous or harmful use of '{findings['risky']}'."
+
+    return None
+
+
+def technical_signal_error(findings: dict) -> Optional[str]:
+    return None if findings["tech"] else NO_SIGNAL_ERROR
+
+
+def validate_document_type(text: str) -> Optional[str]:
+    """
+    Validates if the document appears to be a resume.
+    Rejects content that looks like offer letters, huge certificates, or non-resume text.
+    """
+    return document_type_error(text, scan(text))
+
+
 def validate_safety_intent(text: str) -> Optional[str]:
     """
     Detects explicit illegal or harmful intent in job descriptions.
     Allows metaphorical 'killer', 'ninja' only when modifying a noun.
     """
-    text_lower = text.lower()
-
-    # 1. Illegal Intent - Immediate Rejection
-    illegal_phrases = [
-        "steal money",
-        "hack bank", 
-        "credit card theft",
-        "evade taxes",
-        "money laundering",
-        "sell drugs",
-        "harmful software",
-        "malware distribution"
-    ]
-    
-    for phrase in illegal_phrases:
-        if phrase in text_lower:
-            return "Safety Violation: Illegal or harmful content detected."
-
-    # 2. Metaphorical vs Identity Check
-    # "risky" words that are allowed ONLY if they modify a relevant noun
-    risky_words = ["killer", "ninja", "rockstar", "pirate"]
-    
-    # Allowed contexts: word followed by specific professional nouns
-    allowed_contexts = r"(developer|coder|programmer|engineer|manager|architect|designer|skill|feature|app|code|software)"
-    
-    # Pattern to find risky words
-    # We look for the word, then check if it's followed by an allowed context.
-    # If it is NOT followed by an allowed context, we trigger a violation (or check if it's an identity).
-    
-    for word in risky_words:
-        # Find all occurrences of the word
-        # Using word boundary \b to avoid matching inside other words
-        matches = list(re.finditer(rf"\b{word}\b", text_lower))
-        
-        if not matches:
-            continue
-
-        # For each match, check context
-        for match in matches:
-            # Check if this specific instance is followed by an allowed noun "soon" (to account for maybe 'frontend __')
-            # But specific requirement said: "modify a role or skill"
-            
-            # Let's check the immediate context (next word(s))
-            # Create a small window after the word
-            start_search = match.end()
-            end_search = min(len(text_lower), start_search + 30) # Look ahead 30 chars
-            next_chunk = text_lower[start_search:end_search]
-            
-            if re.match(rf"\s+{allowed_contexts}", next_chunk):
-                continue # This usage is valid (e.g. "killer feature")
-            
-            # If not in allowed context, check if it's an identity phrase or noun usage that we want to reject
-            # e.g. "is a killer", "looking for a ninja" (without specific role attached immediately?)
-            
-            # The rule: "Reject when such terms appear as nouns or identity-defining phrases"
-            # "Reject ambiguous phrasing rather than attempting interpretation."
-            
-            # Simplest interpretation: If it's NOT explicitly "word noun", it's suspicious.
-            # "ninja developer" -> OK
-            # "python ninja" -> This is "noun word". The requirement said "modify a role". "python ninja" -> ninja modifies python? or ninja is the head noun? 
-            # Usually "ninja" in "python ninja" acts as the noun signifying expertise. 
-            # Wait, user said: "Ignore metaphorical adjectives ... when they modify a role or skill". 
-            # "ninja developer" (ninja is adj). 
-            # "python ninja" (ninja is noun). 
-            # "Reject when such terms appear as nouns". 
-            # So "python ninja" might be rejected under strict reading? 
-            # User example: "developer who is a killer" -> Reject.
-            # "killer code" -> "killer" modifies "code" -> OK.
-            
-            # Let's stick to the rule: Must match `(killer|ninja) (noun)` pattern to be safe.
-            # If "python ninja" is common, maybe we should add it? 
-            # But let's start strict as requested: "Prefer rejection over misinterpretation".
-            
-            return f"Safety Violation: Ambiguous or harmful use of '{word}'."
-
-    return None
+    return safety_error(scan(text))
 
 
 def validate_technical_signal(text: str) -> Optional[str]:
@@ -120,29 +208,27 @@ def validate_technical_signal(text: str) -> Optional[str]:
     Checks if the JD contains any technical signal (keywords or general technical terms).
     Returns an error message if NO signal is found.
     """
-    text_lower = text.lower()
-    
-    # 1. Check against specific Tech Skills (from keywords_finder)
-    # Flatten the list of all aliases
-    for aliases in TECH_SKILLS.values():
-        for alias in aliases:
-            if alias in text_lower:
-                return None # Valid
-
-    # 2. Check against General Technical Terms
-    # These are broad terms that indicate a technical role even if specific stack isn't in our limited DB
-    general_terms = [
-        "software", "developer", "engineer", "devops", "architect", 
-        "frontend", "backend", "fullstack", "mobile", "web", 
-        "app", "application", "system", "database", "cloud", 
-        "api", "server", "code", "programming", "coding", 
-        "technical", "technology", "data", "algorithm", 
-        "security", "network", "framework", "library", "tool"
-    ]
-
-    for term in general_terms:
-        if term in text_lower:
-            return None # Valid
-
-    return "Invalid Job Description. No technical keywords or relevant terms found."
+    return technical_signal_error(scan(text))
+
 
+def validate_job_description(text: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Safety and technical-signal verdicts for a JD from a single scan.
+    Returns (safety_error, technical_signal_error).
+    """
+    findings = scan(text)
+    return safety_error(findings), technical_signal_error(findings)
+
+
+def validate_document_types(texts: Iterable[str]) -> List[Optional[str]]:
+    """
+    validate_document_type for a batch of texts, compiling the scanner once.
+    """
+    return [document_type_error(text, scan(text)) for text in texts]
+
+
+def validate_job_descriptions(texts: Iterable[str]) -> List[Tuple[Optional[str], Optional[str]]]:
+    """
+    validate_job_description for a batch of texts.
+    """
+    return [validate_job_description(text) for text in texts]
@@ -0,0 +1,141 @@
+import numpy as np
+
+# Must match the defaults of skills_scoring, experience_scoring and project_scoring.
+SKILLS_MAX = 60
+EXPERIENCE_MAX, EXPERIENCE_BASE, EXPERIENCE_ACTION_BONUS, EXPERIENCE_RELEVANCE_BONUS = 25, 5, 3, 2
+PROJECTS_MAX, PROJECTS_BASE, PROJECTS_ACTION_BONUS = 15, 3, 2
+
+
+class ResumeMatrix:
+    """
+    The section skill sets of many resumes as boolean rows, one column per skill
+    seen anywhere in the pool, plus per-row "has actions" flags. Built once per
+    pool and scored against any number of JDs.
+    """
+
+    __slots__ = ("columns", "skills", "experience", "projects", "experience_actions", "project_actions")
+
+    def __init__(self, analyses: list):
+        # `analyses` are analyze_resume() results that were not rejected.
+        vocabulary = sorted({
+            skill
+            for analysis in analyses
+            for section in analysis["skills"].values()
+            for skill in section
+        })
+        self.columns = {skill: column for column, skill in enumerate(vocabulary)}
+
+        shape = (len(analyses), len(vocabulary))
+        self.skills = np.zeros(shape, dtype=bool)
+        self.experience = np.zeros(shape, dtype=bool)
+        self.projects = np.zeros(shape, dtype=bool)
+        self.experience_actions = np.zeros(len(analyses), dtype=bool)
+        self.project_actions = np.zeros(len(analyses), dtype=bool)
+
+        for row, analysis in enumerate(analyses):
+            for name, matrix in (("skills", self.skills), ("experience", self.experience), ("projects", self.projects)):
+                matrix[row, [self.columns[skill] for skill in analysis["skills"][name]]] = True
+            self.experience_actions[row] = bool(analysis["actions"]["experience"])
+            self.project_actions[row] = bool(analysis["actions"]["projects"])
+
+    def __len__(self) -> int:
+        return len(self.experience_actions)
+
+
+def score_matrix(matrix: ResumeMatrix, jd_skills: set) -> dict:
+    """
+    Scores every resume in the matrix against one JD with a handful of array ops.
+    Returns int arrays "final", "skills", "experience" and "projects", identical
+    to what the per-resume scorers and calculate_final_score produce.
+    """
+    jd_columns = [matrix.columns[skill] for skill in jd_skills if skill in matrix.columns]
+
+    def matched(section: np.ndarray) -> np.ndarray:
+        return section[:, jd_columns].sum(axis=1)
+
+    return score_arrays(
+        len(jd_skills),
+        matched(matrix.skills), matched(matrix.experience), matched(matrix.projects),
+        matrix.experience.any(axis=1) | matrix.experience_actions,
+        matrix.projects.any(axis=1) | matrix.project_actions,
+        matrix.experience_actions, matrix.project_actions
+    )
+
+
+def score_arrays(
+    jd_count: int,
+    skills_matched: np.ndarray,
+    experience_matched: np.ndarray,
+    projects_matched: np.ndarray,
+    has_experience: np.ndarray,
+    has_projects: np.ndarray,
+    experience_actions: np.ndarray,
+    project_actions: np.ndarray
+) -> dict:
+    """
+    The scoring formulas over per-resume counts of matched JD skills per section and
+    per-resume flags (a section "has" content if it has skills or actions).
+    """
+    def usage(matched: np.ndarray, budget) -> np.ndarray:
+        # round(ratio * budget): same float ops as the scalar code, and np.rint rounds
+        # half to even exactly like Python's round().
+        return np.rint(matched / jd_count * budget).astype(np.int64)
+
+    n = len(has_experience)
+    experience_bonus = np.where(experience_actions, EXPERIENCE_ACTION_BONUS, 0)
+    project_bonus = np.where(project_actions, PROJECTS_ACTION_BONUS, 0)
+
+    if not jd_count:
+        skills = np.full(n, SKILLS_MAX, dtype=np.int64)
+        experience = np.minimum(EXPERIENCE_BASE + experience_bonus, EXPERIENCE_MAX)
+        projects = np.minimum(PROJECTS_BASE + project_bonus, PROJECTS_MAX)
+    else:
+        skills = usage(skills_matched, SKILLS_MAX)
+
+        relevance_bonus = np.where(
+            (experience_matched == 0) & experience_actions,
+            EXPERIENCE_RELEVANCE_BONUS, 0
+        )
+        experience = np.minimum(
+            EXPERIENCE_BASE + experience_bonus + relevance_bonus
+            + usage(experience_matched, EXPERIENCE_MAX - EXPERIENCE_BASE - experience_bonus),
+            EXPERIENCE_MAX
+        )
+        projects = np.minimum(
+            PROJECTS_BASE + project_bonus
+            + usage(projects_matched, PROJECTS_MAX - PROJECTS_BASE - project_bonus),
+            PROJECTS_MAX
+        )
+
+    experience = np.where(has_experience, experience, 0)
+    projects = np.where(has_projects, projects, 0)
+
+    return {
+        "final": np.minimum(skills + experience + projects, 100),
+        "skills": skills,
+        "experience": experience,
+        "projects": projects
+    }
+
+
+def top_k(matrix: ResumeMatrix, jd_skills: set, k: int, scores: dict = None) -> list:
+    """
+    Returns [(row, final_score), ...] for the k best resumes, highest score first
+    and ties in row order, without building a result for every resume. Pass the
+    caller's score_matrix() result as `scores` to avoid scoring twice.
+    """
+    if scores is None:
+        scores = score_matrix(matrix, jd_skills)
+    final = scores["final"]
+    k = min(k, len(final))
+    if k <= 0:
+        return []
+
+    candidates = np.argpartition(-final, k - 1)[:k] if k < len(final) else np.arange(len(final))
+    # Rows that tie with the k-th score but fell outside the partition would make the
+    # order unstable, so re-select among everything at or above the cutoff.
+    cutoff = final[candidates].min()
+    candidates = np.flatnonzero(final >= cutoff)
+    ranked = candidates[np.lexsort((candidates, -final[candidates]))][:k]
+
+    return [(int(row), int(final[row])) for row in ranked]
@@ -0,0 +1,18 @@
+import pytest
+from fastapi import HTTPException
+from services import admin_auth
+
+
+def test_admin_routes_need_the_token(monkeypatch):
+    monkeypatch.setattr(admin_auth, "ADMIN_TOKEN", "")
+    with pytest.raises(HTTPException) as disabled:
+        admin_auth.require_admin("anything")
+    assert disabled.value.status_code == 403
+
+    monkeypatch.setattr(admin_auth, "ADMIN_TOKEN", "s3cret")
+    for token in (None, "", "wrong"):
+        with pytest.raises(HTTPException) as rejected:
+            admin_auth.require_admin(token)
+        assert rejected.value.status_code == 403
+
+    admin_auth.require_admin("s3cret")
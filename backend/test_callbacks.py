@@ -0,0 +1,26 @@
+from services import callbacks
+from services.callbacks import callback_error
+
+
+def test_callbacks_to_internal_addresses_are_refused():
+    for url in (
+        "http://127.0.0.1:8000/hook",
+        "http://localhost/hook",
+        "http://10.0.0.5/hook",
+        "http://169.254.169.254/latest/meta-data",
+        "http://[::1]/hook",
+        "http://[::ffff:192.168.0.1]/hook",
+        "ftp://8.8.8.8/hook",
+        "http://8.8.8.8:notaport/hook",
+    ):
+        assert callback_error(url), url
+
+    assert callback_error("https://8.8.8.8/hook") is None
+
+
+def test_allow_listed_hosts_may_be_private(monkeypatch):
+    monkeypatch.setattr(callbacks, "CALLBACK_ALLOWED_HOSTS", ["127.0.0.1", ".internal"])
+
+    assert callback_error("http://127.0.0.1:9000/hook") is None
+    assert callback_error("http://hooks.internal/done") is None
+    assert callback_error("http://10.0.0.5/hook")
@@ -0,0 +1,32 @@
+import random
+from services.candidate_pool import CandidateIndex
+from services.vector_scoring import ResumeMatrix, top_k
+
+VOCABULARY = [f"skill{i}" for i in range(30)]
+
+
+def random_analysis(rng: random.Random) -> dict:
+    def section(p):
+        return frozenset(skill for skill in VOCABULARY if rng.random() < p)
+
+    return {
+        "skills": {"skills": section(0.15), "experience": section(0.05 * rng.randint(0, 2)), "projects": section(0.05 * rng.randint(0, 2))},
+        "actions": {name: frozenset({"build"}) if rng.random() < 0.5 else frozenset() for name in ("skills", "experience", "projects")}
+    }
+
+
+def test_top_matches_scoring_every_resume():
+    rng = random.Random(7)
+    analyses = [random_analysis(rng) for _ in range(400)]
+    index = CandidateIndex()
+    for row, analysis in enumerate(analyses):
+        index.add(row + 1, analysis)
+    matrix = ResumeMatrix(analyses)
+
+    for _ in range(60):
+        jd_skills = set(rng.sample(VOCABULARY + ["unknown"], rng.randint(0, 8)))
+        k = rng.choice((1, 5, 50, 1000))
+        expected = [(row + 1, score) for row, score in top_k(matrix, jd_skills, k)]
+        ranked = index.top(jd_skills, k)["ranked"]
+        assert [(id, final) for id, final, *_ in ranked] == expected
+        assert all(final == min(sum(parts), 100) for _, final, *parts in ranked)
@@ -0,0 +1,41 @@
+from datetime import date
+from models import SkillRollup, DailyRollup
+from services.evaluation_store import record_evaluations, add_to_rollups, _add_to_rollups_portable, admin_stats
+
+
+def rollups(db) -> tuple:
+    return (
+        {row.skill: row.missing_count for row in db.query(SkillRollup)},
+        {row.day: (row.evaluation_count, row.score_sum) for row in db.query(DailyRollup)},
+    )
+
+
+def test_rollups_accumulate_across_writes(db):
+    record_evaluations(db, [("a@example.com", 80, ["aws", "docker"]), ("b@example.com", 40, ["aws", "aws"])])
+    record_evaluations(db, [("a@example.com", 60, ["docker", "sql"])])
+
+    skills, days = rollups(db)
+    assert skills == {"aws": 2, "docker": 2, "sql": 1}
+    assert list(days.values()) == [(3, 180)]
+    assert admin_stats(db) == {"total_users": 0, "avg_score": 60.0, "top_missing_skills": ["aws", "docker", "sql"]}
+
+
+def test_portable_fallback_matches_the_upsert(db):
+    day = date(2026, 1, 1)
+    add_to_rollups(db, {"aws": 1}, {day: (1, 50)})
+    add_to_rollups(db, {"aws": 2, "sql": 1}, {day: (2, 70)})
+    db.commit()
+    upserted = rollups(db)
+
+    db.query(SkillRollup).delete()
+    db.query(DailyRollup).delete()
+    for skills, totals in (({"aws": 1}, (1, 50)), ({"aws": 2, "sql": 1}, (2, 70))):
+        _add_to_rollups_portable(
+            db,
+            [{"skill": skill, "missing_count": count} for skill, count in skills.items()],
+            [{"day": day, "evaluation_count": totals[0], "score_sum": totals[1]}]
+        )
+        db.flush()
+    db.commit()
+
+    assert rollups(db) == upserted == ({"aws": 3, "sql": 1}, {day: (3, 120)})
@@ -0,0 +1,31 @@
+from sqlalchemy.orm import sessionmaker
+from models import Evaluation, DailyRollup
+from services import evaluation_writer as writer_module
+from services.evaluation_writer import EvaluationWriter
+
+
+def test_rows_are_written_in_batches_and_flushed_on_stop(db, monkeypatch):
+    monkeypatch.setattr(writer_module, "SessionLocal", sessionmaker(bind=db.get_bind()))
+    batches = []
+    record = writer_module.record_evaluations
+    monkeypatch.setattr(writer_module, "record_evaluations", lambda session, rows: (batches.append(len(rows)), record(session, rows)))
+
+    writer = EvaluationWriter(batch_size=3, interval=0.05)
+    for index in range(7):
+        writer.submit(f"user{index}@example.com", 10 * index, ["aws"])
+    writer.start()
+    writer.stop()
+
+    assert batches == [3, 3, 1]
+    assert db.query(Evaluation).count() == 7
+    assert [(row.evaluation_count, row.score_sum) for row in db.query(DailyRollup)] == [(7, 210)]
+
+
+def test_a_full_queue_drops_rows_instead_of_blocking(monkeypatch):
+    monkeypatch.setattr(writer_module, "WRITE_QUEUE_SIZE", 2)
+    writer = EvaluationWriter()
+
+    for _ in range(5):
+        writer.submit("user@example.com", 50, [])
+
+    assert writer.dropped == 3
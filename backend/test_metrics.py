@@ -0,0 +1,29 @@
+import pytest
+from services.metrics import Histogram, collect, record, observe, stage_seconds, METRICS_ENABLED
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("test_seconds", "Test.", (0.1, 1.0), "stage")
+    for value in (0.05, 0.5, 0.5, 5.0):
+        histogram.observe(value, "parse")
+
+    lines = histogram.render()
+    assert 'test_seconds_bucket{stage="parse",le="0.1"} 1' in lines
+    assert 'test_seconds_bucket{stage="parse",le="1.0"} 3' in lines
+    assert 'test_seconds_bucket{stage="parse",le="+Inf"} 4' in lines
+    assert 'test_seconds_count{stage="parse"} 4' in lines
+
+
+@pytest.mark.skipif(not METRICS_ENABLED, reason="METRICS_ENABLED=0")
+def test_collected_observations_are_recorded_by_the_parent():
+    def work():
+        observe(stage_seconds.name, 0.25, "collected")
+        return "done"
+
+    result, observations = collect(work)
+    assert result == "done"
+    assert observations == [(stage_seconds.name, 0.25, "collected")]
+    assert "collected" not in stage_seconds._series
+
+    record(observations)
+    assert stage_seconds._series["collected"][1] == 0.25
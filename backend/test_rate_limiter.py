@@ -0,0 +1,53 @@
+import asyncio
+import pytest
+from fastapi import HTTPException
+from services.coalescing import Coalescer
+from services.rate_limiter import MemoryBucketStore, RateLimiter
+
+
+def test_limiter_rejects_past_the_burst_with_retry_after():
+    limiter = RateLimiter(MemoryBucketStore(), per_minute=6, burst=2)
+
+    limiter.check("ip:10.0.0.1")
+    limiter.check("ip:10.0.0.1")
+    with pytest.raises(HTTPException) as rejected:
+        limiter.check("ip:10.0.0.1")
+
+    assert rejected.value.status_code == 429
+    assert 0 < int(rejected.value.headers["Retry-After"]) <= 10
+    limiter.check("ip:10.0.0.2") # Other clients have their own bucket
+
+
+def test_large_batches_pay_their_full_cost():
+    limiter = RateLimiter(MemoryBucketStore(), per_minute=60, burst=10)
+
+    limiter.check("ip:1.2.3.4", cost=2000)
+    with pytest.raises(HTTPException) as rejected:
+        limiter.check("ip:1.2.3.4")
+
+    # 1990 files of debt plus one token, at one per second.
+    assert int(rejected.value.headers["Retry-After"]) >= 1990
+
+
+def test_identical_requests_share_one_task():
+    calls = []
+
+    async def evaluate():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"final_score": 80}
+
+    async def run():
+        coalescer = Coalescer(window=0)
+        first, started = coalescer.task("key", evaluate)
+        second, joined = coalescer.task("key", evaluate)
+        results = await asyncio.gather(asyncio.shield(first), asyncio.shield(second))
+        await asyncio.sleep(0)
+        return started, joined, results, len(coalescer)
+
+    started, joined, results, pending = asyncio.run(run())
+
+    assert (started, joined) == (True, False)
+    assert results == [{"final_score": 80}] * 2
+    assert len(calls) == 1
+    assert pending == 0
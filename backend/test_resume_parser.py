@@ -0,0 +1,19 @@
+import pytest
+from benchmarks.corpus import resume_pdf
+from services.resume_parser import extract_text, extract_page_range, DocumentTooLarge
+
+pytest.importorskip("pypdfium2")
+
+
+def test_pypdfium2_reads_the_same_text_as_pdfplumber(tmp_path):
+    pdf = resume_pdf(3, seed=1)
+    path = tmp_path / "resume.pdf"
+    path.write_bytes(pdf)
+
+    assert extract_text(pdf, backend="pypdfium2") == extract_text(pdf, backend="pdfplumber")
+    assert extract_page_range(str(path), 1, 3, backend="pypdfium2") == extract_page_range(str(path), 1, 3, backend="pdfplumber")
+
+
+def test_pypdfium2_enforces_the_page_limit():
+    with pytest.raises(DocumentTooLarge):
+        extract_text(resume_pdf(3, seed=1), max_pages=2, backend="pypdfium2")
@@ -0,0 +1,45 @@
+from services.section_splitter import found_sections, section_spans, section_splitter
+
+
+RESUME = """jane doe
+Professional Experience:
+built apis in python
+PROJECTS —
+resume scorer
+Keywords
+fastapi
+Skills
+java
+"""
+
+
+def test_heading_variants_and_trailing_punctuation():
+    sections = section_splitter(RESUME)
+
+    assert sections["experience"] == "built apis in python\n"
+    assert sections["projects"] == "resume scorer\n"
+    assert sections["skills"] == "java\n"
+
+
+def test_keywords_section_is_kept_separate():
+    assert section_splitter(RESUME)["keywords"] == "fastapi\n"
+
+
+def test_spans_are_offsets_into_the_original_text():
+    spans = section_spans(RESUME)
+
+    (start, end), = spans["projects"]
+    assert RESUME[start:end] == "resume scorer\n"
+    assert spans["education"] == []
+
+
+def test_repeated_heading_adds_a_span():
+    text = "skills\npython\nexperience\nbuilt x\nskills\njava"
+
+    assert section_splitter(text)["skills"] == "python\njava"
+    assert len(section_spans(text)["skills"]) == 2
+
+
+def test_text_before_the_first_heading_is_ignored():
+    assert found_sections("skills set\nnot a heading") == set()
+    assert all(text == "" for text in section_splitter("just a summary\n").values())
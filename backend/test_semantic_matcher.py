@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+import spacy
+from services.semantic_matcher import SemanticIndex
+
+VOCABULARY = {
+    "sql": ["sql"],
+    "kubernetes": ["kubernetes"],
+    "machine learning": ["machine learning"],
+}
+
+
+def _vocab():
+    # Hand-made vectors: synonyms point the same way, everything else elsewhere.
+    rng = np.random.default_rng(0)
+    directions = {name: rng.normal(size=16) for name in ("db", "orchestration", "machine", "learning", "fruit")}
+    words = {
+        "sql": "db", "postgresql": "db",
+        "kubernetes": "orchestration", "k8s": "orchestration",
+        "machine": "machine", "learning": "learning",
+        "banana": "fruit",
+    }
+    nlp = spacy.blank("en")
+    for word, direction in words.items():
+        nlp.vocab.set_vector(word, (directions[direction] + rng.normal(scale=0.05, size=16)).astype(np.float32))
+    return nlp.vocab
+
+
+def test_synonyms_map_to_canonical_skills():
+    index = SemanticIndex(VOCABULARY, _vocab(), threshold=0.9, max_ngram=2)
+
+    assert index.find(["postgresql", "banana", "k8s"]) == {"sql", "kubernetes"}
+    assert index.find(["machine", "learning"]) == {"machine learning"}
+    assert index.find(["banana", "unknownword"]) == set()
+    assert index.find([]) == set()
+
+
+def test_ann_index_agrees_with_the_matrix():
+    pytest.importorskip("hnswlib")
+    vocab = _vocab()
+    tokens = ["postgresql", "banana", "k8s", "machine", "learning"]
+
+    exact = SemanticIndex(VOCABULARY, vocab, threshold=0.9)
+    approximate = SemanticIndex(VOCABULARY, vocab, threshold=0.9, ann_min_rows=1)
+
+    assert approximate.ann is not None
+    assert approximate.find(tokens) == exact.find(tokens)
@@ -0,0 +1,56 @@
+from services.skill_matcher import SkillMatcher, alias_words
+
+
+VOCABULARY = {
+    "react": ["react", "reactjs", "react.js"],
+    "machine learning": ["machine learning", "ml"],
+    "spring": ["spring boot"],
+    "rails": ["ruby on rails"],
+    "cpp": ["c++"],
+    "csharp": ["c#"],
+}
+
+
+def test_single_and_symbolic_aliases():
+    matcher = SkillMatcher(VOCABULARY)
+
+    assert matcher.find(["build", "react.js", "app", "c#"]) == {"react", "csharp"}
+    assert matcher.find(["c++"]) == {"cpp"}
+
+
+def test_multi_word_aliases_need_the_full_phrase():
+    matcher = SkillMatcher(VOCABULARY)
+
+    assert matcher.find(["machine", "learning", "pipeline"]) == {"machine learning"}
+    assert matcher.find(["machine", "shop", "learning"]) == set()
+    assert matcher.find(["spring"]) == set()
+    assert matcher.find(["java", "spring", "boot"]) == {"spring"}
+
+
+def test_stop_words_are_dropped_from_aliases():
+    assert alias_words("Ruby on Rails") == ("ruby", "rails")
+    assert SkillMatcher(VOCABULARY).find(["ruby", "rails"]) == {"rails"}
+
+
+def test_symbolic_terms_are_reported():
+    assert SkillMatcher(VOCABULARY).symbolic_terms == {"react.js", "c++", "c#"}
+
+
+def test_plural_aliases_match_the_lemma_stream():
+    from services.nlp_processor import preprocess, lemmatize_phrases
+
+    vocabulary = {"data structures": ["data structures"], "neural networks": ["Neural Networks"], "ml": ["machine learning"]}
+    matcher = SkillMatcher(vocabulary, lemmatize_phrases)
+    tokens = preprocess("Strong grasp of data structures, neural networks and machine learning")
+
+    assert matcher.find(tokens) == {"data structures", "neural networks", "ml"}
+    assert SkillMatcher(vocabulary).find(tokens) == set()
+
+
+def test_single_word_aliases_are_not_lemmatized():
+    from services.nlp_processor import preprocess, lemmatize_phrases
+
+    matcher = SkillMatcher({"aws": ["aws"]}, lemmatize_phrases)
+
+    assert matcher.find(preprocess("aw shucks we saw a panda")) == set()
+    assert matcher.find(["aws", "lambda"]) == {"aws"}
@@ -0,0 +1,22 @@
+from models import User
+from services.user_roles import get_or_create_role, set_user_role, role_cache
+
+
+def test_first_login_creates_the_user_once(db):
+    role_cache.clear()
+
+    assert get_or_create_role(db, "ada@example.com", "Ada") == "user"
+    role_cache.clear()
+    assert get_or_create_role(db, "ada@example.com", "Ada Again") == "user"
+
+    users = db.query(User).filter(User.email == "ada@example.com").all()
+    assert [user.name for user in users] == ["Ada"]
+
+
+def test_role_change_drops_the_cached_role(db):
+    role_cache.clear()
+    get_or_create_role(db, "ada@example.com", "Ada")
+
+    assert set_user_role(db, "ada@example.com", "admin")
+    assert get_or_create_role(db, "ada@example.com", "Ada") == "admin"
+    assert not set_user_role(db, "nobody@example.com", "admin")
@@ -0,0 +1,39 @@
+from services.validators import (
+    validate_document_type, validate_safety_intent, validate_technical_signal,
+    validate_job_description, validate_document_types, scan
+)
+from services.evaluation_pipeline import check_job_description
+
+
+def test_document_type():
+    assert validate_document_type("We are pleased to offer you the position. " * 3) is not None
+    assert validate_document_type("hi") == "Invalid Document. Content too short to be a resume."
+    assert validate_document_type("software engineer resume with skills in python and java, five years") is None
+
+
+def test_risky_words_need_an_allowed_noun():
+    assert validate_safety_intent("we want a ninja developer and killer features") is None
+    assert validate_safety_intent("a developer who is a killer") == "Safety Violation: Ambiguous or harmful use of 'killer'."
+    # Reported in list order, not text order
+    assert validate_safety_intent("pirate ninja") == "Safety Violation: Ambiguous or harmful use of 'ninja'."
+    assert validate_safety_intent("ninjas welcome") is None
+
+
+def test_overlapping_phrases_of_different_kinds_are_all_found():
+    findings = scan("harmful software")
+    assert findings["illegal"] and findings["tech"]
+    assert validate_job_description("Hack bank systems") == (
+        "Safety Violation: Illegal or harmful content detected.", None
+    )
+
+
+def test_technical_signal_and_bulk():
+    assert validate_technical_signal("gardening and flowers") is not None
+    assert validate_technical_signal("React.js frontend") is None
+    assert validate_document_types(["hi", "x" * 60]) == [validate_document_type("hi"), None]
+
+
+def test_job_description_verdict_ignores_line_breaks():
+    jd = "Python developer with AWS and Docker, to steal{}money from clients"
+    assert check_job_description(jd.format("\n")) == check_job_description(jd.format(" "))
+    assert check_job_description(jd.format("\n"))["match_level"] == "Safety Violation"
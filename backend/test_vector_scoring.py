@@ -0,0 +1,66 @@
+import random
+from services.skills_scoring import skills_scoring
+from services.experience_scoring import experience_scoring
+from services.project_scoring import project_scoring
+from services.calculate_final_score import calculate_final_score
+from services.vector_scoring import ResumeMatrix, score_matrix, top_k
+
+SKILLS = ["react", "nodejs", "python", "java", "sql", "docker", "aws", "fastapi", "git"]
+
+
+def _random_analysis(rng: random.Random) -> dict:
+    def sample():
+        return frozenset(rng.sample(SKILLS, rng.randint(0, 4))) if rng.random() < 0.8 else frozenset()
+
+    return {
+        "skills": {"skills": sample(), "experience": sample(), "projects": sample()},
+        "actions": {
+            "experience": frozenset({"build"}) if rng.random() < 0.5 else frozenset(),
+            "projects": frozenset({"design"}) if rng.random() < 0.5 else frozenset(),
+        },
+    }
+
+
+def _scalar_scores(analysis: dict, jd_skills: set) -> tuple:
+    skills, actions = analysis["skills"], analysis["actions"]
+    skill_score = skills_scoring(skills["skills"], jd_skills)
+    experience_score = experience_scoring(skills["experience"], actions["experience"], jd_skills)
+    project_score = project_scoring(skills["projects"], actions["projects"], jd_skills)
+    final = calculate_final_score(
+        skill_score, experience_score, project_score, jd_skills,
+        skills["skills"], skills["experience"], skills["projects"]
+    )
+    return final.final_score, skill_score.score, experience_score.score, project_score.score
+
+
+def test_matrix_scores_match_the_scalar_scorers():
+    rng = random.Random(7)
+    analyses = [_random_analysis(rng) for _ in range(500)]
+    matrix = ResumeMatrix(analyses)
+
+    for jd_size in range(0, 8):
+        jd_skills = set(rng.sample(SKILLS, jd_size)) | ({"kubernetes"} if jd_size % 3 == 0 else set())
+        scores = score_matrix(matrix, jd_skills)
+
+        for row, analysis in enumerate(analyses):
+            expected = _scalar_scores(analysis, jd_skills)
+            assert expected == (
+                scores["final"][row], scores["skills"][row], scores["experience"][row], scores["projects"][row]
+            )
+
+
+def test_top_k_orders_by_score_then_row():
+    rng = random.Random(3)
+    analyses = [_random_analysis(rng) for _ in range(200)]
+    jd_skills = {"python", "aws", "docker"}
+
+    expected = sorted(
+        ((row, _scalar_scores(analysis, jd_skills)[0]) for row, analysis in enumerate(analyses)),
+        key=lambda item: (-item[1], item[0])
+    )
+
+    assert top_k(ResumeMatrix(analyses), jd_skills, 25) == expected[:25]
+    assert top_k(ResumeMatrix(analyses), jd_skills, 500) == expected
+    matrix = ResumeMatrix(analyses)
+    assert top_k(matrix, jd_skills, 25, score_matrix(matrix, jd_skills)) == expected[:25]
+    assert top_k(ResumeMatrix([]), jd_skills, 5) == []